@@ -0,0 +1,117 @@
+"""
+Async Database Benchmark
+
+Compares requests/sec of a contacts listing served by a synchronous `Session`
+(handler runs in the worker threadpool) against the same query served by an
+`AsyncSession` (handler runs on the event loop).
+
+Both handlers run inside one FastAPI app and are driven in-process through
+`httpx.ASGITransport`, so the numbers reflect one worker without network noise.
+
+Usage:
+    python -m benchmarks.async_db [--rows 5000] [--requests 2000] [--concurrency 64]
+
+    By default a temporary SQLite file is used as a stand-in. Set `DATABASE_URL`
+    to point the benchmark at a local PostgreSQL instance instead; only the contacts
+    of the `bench@example.com` user are replaced there. The rest of the
+    application settings (.env) must be available, as for the app itself.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.database import db
+from src.database.models import Contact, User
+
+contacts = Contact.__table__
+users = User.__table__
+# Власник згенерованих контактів
+BENCH_OWNER = "bench@example.com"
+
+
+def build_app(page_size: int, owner_id: int) -> FastAPI:
+    """Build an app exposing the same listing query through both session types."""
+    app = FastAPI()
+
+    @app.get("/sync/")
+    def list_sync(session: Session = Depends(db.get_db)):
+        query = select(contacts).where(contacts.c.owner_id == owner_id).limit(page_size)
+        return session.execute(query).mappings().all()
+
+    @app.get("/async/")
+    async def list_async(session: AsyncSession = Depends(db.get_async_db)):
+        result = await session.execute(select(contacts).where(contacts.c.owner_id == owner_id).limit(page_size))
+        return result.mappings().all()
+
+    return app
+
+
+def seed(rows: int) -> int:
+    """Replace the contacts of `BENCH_OWNER` with `rows` generated contacts; return the owner's id."""
+    with db.engine.begin() as conn:
+        # Чіпаємо лише рядки власника бенчмарку: DATABASE_URL може вказувати на робочу базу
+        bench_owner = select(users.c.id).where(users.c.email == BENCH_OWNER).scalar_subquery()
+        conn.execute(delete(contacts).where(contacts.c.owner_id == bench_owner))
+        conn.execute(delete(users).where(users.c.email == BENCH_OWNER))
+        owner_id = conn.execute(insert(users).values(email=BENCH_OWNER).returning(users.c.id)).scalar_one()
+        conn.execute(insert(contacts), [
+            {
+                "owner_id": owner_id,
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "email": f"contact{i}@example.com",
+                "phone_number": f"+380{i:09d}",
+            }
+            for i in range(rows)
+        ])
+    return owner_id
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Fire `requests` GETs at `path` with at most `concurrency` in flight; return requests/sec."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await one()  # прогрів пулу з'єднань
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    owner_id = seed(args.rows)
+    app = build_app(args.page_size, owner_id)
+
+    print(f"database: {db.engine.url.render_as_string()}")
+    for label, path in (("sync Session (before)", "/sync/"), ("AsyncSession (after)", "/async/")):
+        rps = asyncio.run(run(app, path, args.requests, args.concurrency))
+        print(f"{label:<24} {rps:10.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+List Serialization Benchmark
+
+Compares requests/sec of a 1000-contact page served three ways:
+
+* ORM objects validated by `response_model=List[ContactResponse]` and encoded with the standard
+  `JSONResponse` (the list endpoints before `CONTACT_FAST_JSON`);
+* the same, but encoded with `ORJSONResponse`, the application's default response class now;
+* the fast path of `CONTACT_FAST_JSON`: column rows turned into dicts and passed to
+  `ORJSONResponse` without validation.
+
+The response cache is not involved, so every request queries and serializes the page. Requests are
+driven in-process through `httpx.ASGITransport`, so the numbers reflect one worker without network
+noise.
+
+Usage:
+    python -m benchmarks.list_serialization [--rows 1000] [--requests 300] [--concurrency 8]
+
+    By default a temporary SQLite file is used as a stand-in. Set `DATABASE_URL` to point the
+    benchmark at a local PostgreSQL instance instead; only the contacts of the `bench@example.com`
+    user are replaced there. The rest of the application settings (.env) must be available, as for
+    the app itself.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import db
+from src.database.models import Contact, User
+from src.schemas import ContactResponse
+from src.services.serialization import CONTACT_COLUMNS, contact_dicts
+
+contacts = Contact.__table__
+users = User.__table__
+# Власник згенерованих контактів
+BENCH_OWNER = "bench@example.com"
+
+
+def build_app(page_size: int, owner_id: int) -> FastAPI:
+    """Build an app exposing the same page through the three serialization paths."""
+    app = FastAPI()
+
+    @app.get("/orm/", response_model=List[ContactResponse], response_class=JSONResponse)
+    async def orm_json(session: AsyncSession = Depends(db.get_async_db)):
+        return (await session.scalars(select(Contact).where(Contact.owner_id == owner_id).limit(page_size))).all()
+
+    @app.get("/orm-orjson/", response_model=List[ContactResponse], response_class=ORJSONResponse)
+    async def orm_orjson(session: AsyncSession = Depends(db.get_async_db)):
+        return (await session.scalars(select(Contact).where(Contact.owner_id == owner_id).limit(page_size))).all()
+
+    @app.get("/rows/")
+    async def rows_orjson(session: AsyncSession = Depends(db.get_async_db)):
+        rows = await session.execute(select(*CONTACT_COLUMNS).where(Contact.owner_id == owner_id).limit(page_size))
+        return ORJSONResponse(contact_dicts(rows))
+
+    return app
+
+
+def seed(rows: int) -> int:
+    """Replace the contacts of `BENCH_OWNER` with `rows` generated contacts; return the owner's id."""
+    with db.engine.begin() as conn:
+        # Чіпаємо лише рядки власника бенчмарку: DATABASE_URL може вказувати на робочу базу
+        bench_owner = select(users.c.id).where(users.c.email == BENCH_OWNER).scalar_subquery()
+        conn.execute(delete(contacts).where(contacts.c.owner_id == bench_owner))
+        conn.execute(delete(users).where(users.c.email == BENCH_OWNER))
+        owner_id = conn.execute(insert(users).values(email=BENCH_OWNER).returning(users.c.id)).scalar_one()
+        conn.execute(insert(contacts), [
+            {
+                "owner_id": owner_id,
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "email": f"contact{i}@example.com",
+                "phone_number": f"+380{i:09d}",
+                "birthday": date(1970, 1, 1) + timedelta(days=i * 7),
+                "additional_data": f"Note about contact {i}" * 4,
+            }
+            for i in range(rows)
+        ])
+    return owner_id
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Fire `requests` GETs at `path` with at most `concurrency` in flight; return requests/sec."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await one()  # прогрів пулу з'єднань
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+
+
+async def bodies(app: FastAPI, paths) -> list:
+    """Fetch each path once and return the decoded JSON bodies."""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        return [(await client.get(path)).json() for path in paths]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    owner_id = seed(args.rows)
+    app = build_app(args.page_size, owner_id)
+
+    paths = (
+        ("response_model + json (before)", "/orm/"),
+        ("response_model + orjson", "/orm-orjson/"),
+        ("column rows + orjson (fast)", "/rows/"),
+    )
+    first, *others = asyncio.run(bodies(app, [path for _, path in paths]))
+    # Швидкий шлях має віддавати рівно те саме, що й response_model
+    assert all(body == first for body in others), "serialization paths disagree"
+
+    print(f"database: {db.engine.url.render_as_string()}, page of {len(first)} contacts")
+    baseline = None
+    for label, path in paths:
+        rps = asyncio.run(run(app, path, args.requests, args.concurrency))
+        baseline = baseline or rps
+        print(f"{label:<32} {rps:8.1f} req/s  x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Password Hashing Benchmark
+
+Measures the login path's password check in two ways:
+
+1. Latency of a single hash/verify for each configured passlib scheme and for the legacy
+   werkzeug hashes, to pick cost parameters (`PASSWORD_*` settings) for the target hardware.
+2. A login storm against an in-process FastAPI app: the password is verified either inline on
+   the event loop (as `User.check_password` used to be called) or in the password pool
+   (`src.services.passwords.verify_password`). Besides requests/sec, the worst event-loop lag
+   seen by a ticker task shows how long unrelated requests would have been stalled.
+
+Usage:
+    python -m benchmarks.password_hashing [--requests 200] [--concurrency 32] [--repeat 5]
+
+    The rest of the application settings (.env) must be available, as for the app itself.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from werkzeug.security import generate_password_hash
+
+from src.conf.config import PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS
+from src.services import passwords
+
+PASSWORD = "correct horse battery staple"
+
+
+def scheme_latency(repeat: int) -> None:
+    """Print the average hash and verify time of every configured scheme and of werkzeug."""
+    candidates = [(scheme, passwords.pwd_context.copy(default=scheme).hash) for scheme in passwords.pwd_context.schemes()]
+    candidates.append(("werkzeug (legacy)", generate_password_hash))
+    for label, hasher in candidates:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            hashed = hasher(PASSWORD)
+        hash_ms = (time.perf_counter() - started) / repeat * 1000
+        started = time.perf_counter()
+        for _ in range(repeat):
+            passwords.verify_password_sync(PASSWORD, hashed)
+        verify_ms = (time.perf_counter() - started) / repeat * 1000
+        print(f"{label:<20} hash {hash_ms:8.1f} ms   verify {verify_ms:8.1f} ms")
+
+
+def build_app(hashed: str) -> FastAPI:
+    """Build an app with the password check of the login route done inline and offloaded."""
+    app = FastAPI()
+
+    @app.post("/inline/")
+    async def login_inline():
+        if not passwords.verify_password_sync(PASSWORD, hashed)[0]:
+            raise HTTPException(status_code=401)
+        return {}
+
+    @app.post("/offloaded/")
+    async def login_offloaded():
+        if not (await passwords.verify_password(PASSWORD, hashed))[0]:
+            raise HTTPException(status_code=401)
+        return {}
+
+    return app
+
+
+@asynccontextmanager
+async def loop_lag_monitor(interval: float = 0.005):
+    """Track the worst delay of a timer that should fire every `interval` seconds."""
+    stats = {"max_ms": 0.0}
+
+    def record(started: float) -> None:
+        stats["max_ms"] = max(stats["max_ms"], (time.perf_counter() - started - interval) * 1000)
+
+    async def tick():
+        while True:
+            started = time.perf_counter()
+            try:
+                await asyncio.sleep(interval)
+            finally:
+                # Тік, що не встиг спрацювати до кінця заміру, теж рахується
+                record(started)
+
+    task = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    try:
+        yield stats
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def storm(app: FastAPI, path: str, requests: int, concurrency: int) -> tuple:
+    """Fire `requests` logins at `path`; return requests/sec and the worst event-loop lag in ms."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.post(path)
+                response.raise_for_status()
+
+        await one()  # прогрів пулу потоків/процесів
+        async with loop_lag_monitor() as lag:
+            started = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(requests)))
+            elapsed = time.perf_counter() - started
+        return requests / elapsed, lag["max_ms"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scheme_latency(args.repeat)
+
+    app = build_app(passwords.hash_password_sync(PASSWORD))
+    print(f"\npool: {PASSWORD_HASH_EXECUTOR} x {PASSWORD_HASH_WORKERS}")
+    for label, path in (("inline (before)", "/inline/"), ("offloaded (after)", "/offloaded/")):
+        rps, lag_ms = asyncio.run(storm(app, path, args.requests, args.concurrency))
+        print(f"{label:<20} {rps:10.1f} logins/s   max loop lag {lag_ms:8.1f} ms")
+    passwords.shutdown()
+
+
+if __name__ == "__main__":
+    main()
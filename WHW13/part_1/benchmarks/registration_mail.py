@@ -0,0 +1,162 @@
+"""
+Registration Mail Benchmark
+
+Measures how the latency of sending a verification email shows up in the registration handler:
+either the message is sent inline over a fresh SMTP connection (as `FastMail` did on every
+registration) or it is handed to `src.services.mail.mail_queue` and delivered in the background
+over a few persistent connections.
+
+The SMTP server is an in-process stand-in that answers every command after `--smtp-latency`
+seconds and rejects a share of messages with a transient 451 reply (`--smtp-failure-rate`), so
+retries are exercised as well.
+
+Usage:
+    python -m benchmarks.registration_mail [--requests 500] [--concurrency 32] [--smtp-latency 0.02]
+
+    The rest of the application settings (.env) must be available, as for the app itself.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# Налаштування пошти мають бути задані до імпорту src.conf.config
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.update(
+    MAIL_SERVER="127.0.0.1",
+    MAIL_USERNAME="",
+    MAIL_FROM="bench@example.com",
+    MAIL_STARTTLS="False",
+    MAIL_RETRY_BACKOFF="0.05",
+)
+
+import httpx
+from aiosmtplib import send
+from fastapi import FastAPI
+
+from src.services.mail import OutgoingMail, mail_queue
+
+
+class SlowSMTPServer:
+    """Minimal SMTP server that delays every reply and fails some messages transiently."""
+
+    def __init__(self, latency: float, failure_rate: float):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.connections = 0
+        self.delivered = 0
+
+    async def reply(self, writer: asyncio.StreamWriter, line: str) -> None:
+        await asyncio.sleep(self.latency)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await self.reply(writer, "220 bench ESMTP")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                await self.reply(writer, "250 bench")
+            elif command == "DATA":
+                await self.reply(writer, "354 End data with <CR><LF>.<CR><LF>")
+                while await reader.readline() not in (b".\r\n", b""):
+                    pass
+                if random.random() < self.failure_rate:
+                    await self.reply(writer, "451 Try again later")
+                else:
+                    self.delivered += 1
+                    await self.reply(writer, "250 OK")
+            elif command == "QUIT":
+                await self.reply(writer, "221 Bye")
+                break
+            else:
+                await self.reply(writer, "250 OK")
+        writer.close()
+
+
+def build_app(port: int) -> FastAPI:
+    """Build an app with the mail step of registration done inline and queued."""
+    app = FastAPI()
+
+    @app.post("/inline/")
+    async def register_inline():
+        mail = OutgoingMail(recipient="user@example.com", subject="Email Verification", body="Your code: 000000")
+        try:
+            await send(mail.to_message(), hostname="127.0.0.1", port=port, start_tls=False)
+        except Exception:
+            pass  # як і раніше, збій SMTP ламав би реєстрацію; тут лише міряємо час
+        return {}
+
+    @app.post("/queued/")
+    async def register_queued():
+        mail_queue.enqueue("user@example.com", "Email Verification", "Your code: 000000")
+        return {}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> list:
+    """Fire `requests` registrations at `path`; return the latency of each in milliseconds."""
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(path)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<20} p50 {statistics.median(latencies):8.1f} ms   p99 {p99:8.1f} ms")
+
+
+async def main(args) -> None:
+    smtp = SlowSMTPServer(args.smtp_latency, args.smtp_failure_rate)
+    server = await asyncio.start_server(smtp.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    os.environ["MAIL_PORT"] = str(port)
+    import src.services.mail as mail
+    mail.MAIL_PORT = port
+
+    app = build_app(port)
+    report("inline (before)", await run(app, "/inline/", args.requests, args.concurrency))
+    inline_connections, smtp.connections, smtp.delivered = smtp.connections, 0, 0
+
+    mail_queue.start()
+    started = time.perf_counter()
+    report("queued (after)", await run(app, "/queued/", args.requests, args.concurrency))
+    while mail_queue.sent + mail_queue.failed < args.requests:
+        await asyncio.sleep(0.01)
+    drained = time.perf_counter() - started
+    await mail_queue.stop()
+
+    print(f"\nSMTP connections: inline {inline_connections}, queued {smtp.connections}")
+    print(
+        f"queued delivery: {mail_queue.sent} sent, {mail_queue.retried} retried, "
+        f"{mail_queue.failed} dead-lettered, drained in {drained:.2f} s"
+    )
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--smtp-latency", type=float, default=0.02)
+    parser.add_argument("--smtp-failure-rate", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,27 @@
+"""contacts keyset pagination index
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-16 10:12:41.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Таблиці створює Base.metadata.create_all, тому індекс міг уже з'явитися
+    op.create_index('ix_contacts_last_name_id', 'contacts', ['last_name', 'id'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_last_name_id', table_name='contacts', if_exists=True)
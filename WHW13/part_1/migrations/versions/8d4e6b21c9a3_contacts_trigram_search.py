@@ -0,0 +1,42 @@
+"""contacts trigram search indexes
+
+Revision ID: 8d4e6b21c9a3
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-16 11:40:07.562931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e6b21c9a3'
+down_revision: Union[str, None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    # GIN-індекси pg_trgm є лише в PostgreSQL; на інших БД пошук іде через services/search.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_contacts_{column}_trgm',
+            'contacts',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f'ix_contacts_{column}_trgm', table_name='contacts')
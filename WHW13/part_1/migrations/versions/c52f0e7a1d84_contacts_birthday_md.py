@@ -0,0 +1,37 @@
+"""contacts birthday month-day column
+
+Revision ID: c52f0e7a1d84
+Revises: 8d4e6b21c9a3
+Create Date: 2026-10-16 13:05:52.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52f0e7a1d84'
+down_revision: Union[str, None] = '8d4e6b21c9a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Таблиці створює Base.metadata.create_all, тому колонка могла вже з'явитися
+    if 'birthday_md' not in {column['name'] for column in sa.inspect(bind).get_columns('contacts')}:
+        op.add_column('contacts', sa.Column('birthday_md', sa.Integer(), nullable=True))
+    op.create_index('ix_contacts_birthday_md', 'contacts', ['birthday_md'], if_not_exists=True)
+
+    if bind.dialect.name == 'postgresql':
+        month_day = "EXTRACT(MONTH FROM birthday) * 100 + EXTRACT(DAY FROM birthday)"
+    else:
+        month_day = "CAST(strftime('%m%d', birthday) AS INTEGER)"
+    op.execute(f"UPDATE contacts SET birthday_md = {month_day} WHERE birthday IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_birthday_md', table_name='contacts', if_exists=True)
+    op.drop_column('contacts', 'birthday_md')
@@ -0,0 +1,42 @@
+"""contacts version and updated_at columns
+
+Revision ID: e7b94d2f6a15
+Revises: c52f0e7a1d84
+Create Date: 2026-10-16 15:21:36.480117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b94d2f6a15'
+down_revision: Union[str, None] = 'c52f0e7a1d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Таблиці створює Base.metadata.create_all, тому колонки могли вже з'явитися
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('contacts')}
+    if 'version' not in columns:
+        op.add_column('contacts', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    if 'updated_at' not in columns:
+        # SQLite не додає колонку з непостійним значенням за замовчуванням, тому спершу заповнюємо її
+        op.add_column('contacts', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+        op.execute("UPDATE contacts SET updated_at = CURRENT_TIMESTAMP")
+        with op.batch_alter_table('contacts') as batch_op:
+            batch_op.alter_column(
+                'updated_at',
+                existing_type=sa.DateTime(timezone=True),
+                nullable=False,
+                server_default=sa.func.now(),
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('contacts') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
@@ -0,0 +1,56 @@
+"""contacts owner and per-owner indexes
+
+Revision ID: f3a0c8e51b27
+Revises: e7b94d2f6a15
+Create Date: 2026-10-16 16:48:12.907345
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a0c8e51b27'
+down_revision: Union[str, None] = 'e7b94d2f6a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OWNER_INDEXES = {
+    'ix_contacts_owner_id_id': ['owner_id', 'id'],
+    'ix_contacts_owner_id_last_name': ['owner_id', 'last_name', 'id'],
+    'ix_contacts_owner_id_birthday_md': ['owner_id', 'birthday_md'],
+}
+
+
+def upgrade() -> None:
+    # Таблиці створює Base.metadata.create_all, тому колонка могла вже з'явитися
+    if 'owner_id' not in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('contacts')}:
+        # Власник наявних контактів невідомий, тому в цій БД колонка лишається nullable:
+        # такі контакти не бачить жоден користувач, доки їм не призначать власника
+        with op.batch_alter_table('contacts') as batch_op:
+            batch_op.add_column(sa.Column('owner_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'fk_contacts_owner_id_users', 'users', ['owner_id'], ['id'], ondelete='CASCADE'
+            )
+
+    # Глобальні індекси замінюються на індекси з префіксом owner_id
+    op.drop_index('ix_contacts_last_name_id', table_name='contacts', if_exists=True)
+    op.drop_index('ix_contacts_birthday_md', table_name='contacts', if_exists=True)
+    op.drop_index('ix_contacts_email', table_name='contacts', if_exists=True)
+    for name, columns in OWNER_INDEXES.items():
+        op.create_index(name, 'contacts', columns, if_not_exists=True)
+    op.create_index('ix_contacts_owner_id_email', 'contacts', ['owner_id', 'email'], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_owner_id_email', table_name='contacts', if_exists=True)
+    for name in OWNER_INDEXES:
+        op.drop_index(name, table_name='contacts', if_exists=True)
+    op.create_index('ix_contacts_email', 'contacts', ['email'], unique=True, if_not_exists=True)
+    op.create_index('ix_contacts_birthday_md', 'contacts', ['birthday_md'], if_not_exists=True)
+    op.create_index('ix_contacts_last_name_id', 'contacts', ['last_name', 'id'], if_not_exists=True)
+    with op.batch_alter_table('contacts') as batch_op:
+        batch_op.drop_constraint('fk_contacts_owner_id_users', type_='foreignkey')
+        batch_op.drop_column('owner_id')
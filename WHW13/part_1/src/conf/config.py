@@ -1,30 +1,149 @@
-"""
-Configuration Module
-
-This module contains configuration settings for the application, such as Cloudinary API credentials.
-
-Attributes:
-    CLOUDINARY_API_KEY (str): Cloudinary API key obtained from your Cloudinary account.
-    CLOUDINARY_API_SECRET (str): Cloudinary API secret obtained from your Cloudinary account.
-    CLOUDINARY_CLOUD_NAME (str): Cloudinary cloud name associated with your Cloudinary account.
-
-Note:
-    Make sure to provide valid Cloudinary API credentials to use the Cloudinary services.
-
-Example:
-    To use these configurations in other modules, you can import them like this:
-
-    >>> from .config import CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET, CLOUDINARY_CLOUD_NAME
-"""
-
-from decouple import config
-
-CLOUDINARY_API_KEY = config('CLOUDINARY_API_KEY')
-CLOUDINARY_API_SECRET = config('CLOUDINARY_API_SECRET')
-CLOUDINARY_CLOUD_NAME = config('CLOUDINARY_CLOUD_NAME')
-
-"""
-CLOUDINARY_API_KEY = 'your-cloudinary-api-key'
-CLOUDINARY_API_SECRET = 'your-cloudinary-api-secret'
-CLOUDINARY_CLOUD_NAME = 'your-cloudinary-cloud-name'
+"""
+Configuration Module
+
+This module contains configuration settings for the application, such as Cloudinary API credentials
+and database connection pool tuning.
+
+Attributes:
+    CLOUDINARY_API_KEY (str): Cloudinary API key obtained from your Cloudinary account.
+    CLOUDINARY_API_SECRET (str): Cloudinary API secret obtained from your Cloudinary account.
+    CLOUDINARY_CLOUD_NAME (str): Cloudinary cloud name associated with your Cloudinary account.
+    DB_POOL_SIZE (int): Number of connections kept open in the database pool.
+    DB_MAX_OVERFLOW (int): Extra connections allowed above DB_POOL_SIZE under load.
+    DB_POOL_TIMEOUT (float): Seconds to wait for a free connection before failing the request.
+    DB_POOL_RECYCLE (int): Seconds after which a pooled connection is replaced (-1 disables).
+    DB_POOL_PRE_PING (bool): Test connections with a lightweight ping on checkout.
+    QUERY_SLOW_MS (float): Repository calls taking at least this many milliseconds are logged as slow.
+    CONTACT_IMPORT_BATCH_SIZE (int): Rows validated and inserted per batch by the bulk contact import.
+    CONTACT_EXPORT_BATCH_SIZE (int): Rows fetched per server-side cursor round trip by the contact export.
+    CONTACT_BATCH_MAX_IDS (int): Most contact ids accepted by one batch update or delete.
+    CONTACT_FAST_JSON (bool): Serve contact lists from plain column rows through orjson, without response-model validation.
+    SEARCH_INDEX_MAX_OWNERS (int): Owners whose in-process contact search index is kept loaded (non-PostgreSQL only).
+    REDIS_URL (str): Redis connection URL shared by the cache; empty to use in-process fallbacks.
+    CACHE_TTL (int): Seconds a cached contact response stays valid.
+    CACHE_MAX_ENTRIES (int): Capacity of the in-process LRU cache used when Redis is not configured.
+    AUTH_CACHE_TTL (int): Longest time in seconds a verified access token is trusted without a user lookup.
+    AUTH_CACHE_MAX_ENTRIES (int): Maximum number of access tokens kept in the authentication cache.
+    PASSWORD_SCHEMES (list): passlib schemes; the first hashes new passwords, the rest are verified and upgraded.
+    PASSWORD_ARGON2_TIME_COST (int): Argon2 iterations.
+    PASSWORD_ARGON2_MEMORY_COST (int): Argon2 memory in KiB.
+    PASSWORD_ARGON2_PARALLELISM (int): Argon2 lanes.
+    PASSWORD_BCRYPT_ROUNDS (int): bcrypt cost factor (log2 of the iterations).
+    PASSWORD_HASH_EXECUTOR (str): "thread" or "process" pool for password hashing.
+    PASSWORD_HASH_WORKERS (int): Number of workers hashing passwords concurrently.
+    MAIL_SERVER (str): SMTP server used for outgoing mail.
+    MAIL_PORT (int): SMTP server port.
+    MAIL_USERNAME (str): SMTP login; empty to send without authentication.
+    MAIL_PASSWORD (str): SMTP password.
+    MAIL_FROM (str): Sender address of outgoing mail.
+    MAIL_STARTTLS (bool): Upgrade the SMTP connection with STARTTLS.
+    MAIL_SSL_TLS (bool): Connect to the SMTP server over implicit TLS instead.
+    MAIL_TIMEOUT (float): Seconds to wait for the SMTP server before a send attempt fails.
+    MAIL_QUEUE_SIZE (int): Maximum number of messages waiting in the outgoing mail queue.
+    MAIL_WORKERS (int): Concurrent delivery workers, each with its own SMTP connection.
+    MAIL_BATCH_SIZE (int): Messages a worker takes off the queue at once.
+    MAIL_IDLE_TIMEOUT (float): Seconds an idle SMTP connection is kept open.
+    MAIL_MAX_ATTEMPTS (int): Send attempts per message before it goes to the dead-letter list.
+    MAIL_RETRY_BACKOFF (float): Delay in seconds before the first retry; doubled on each further retry.
+    MAIL_RETRY_BACKOFF_MAX (float): Upper bound of the retry delay in seconds.
+    MAIL_DEAD_LETTER_SIZE (int): Number of undeliverable messages kept for inspection.
+    AVATAR_STORAGE (str): Where processed avatars are stored: "cloudinary" or "local".
+    AVATAR_LOCAL_DIR (str): Directory of the local avatar storage.
+    AVATAR_LOCAL_URL (str): URL prefix under which the local avatar directory is served.
+    AVATAR_SIZES (list): Square sizes in pixels rendered for every avatar; the first is the user's avatar_url.
+    AVATAR_FORMAT (str): Pillow format the avatars are recompressed to.
+    AVATAR_QUALITY (int): Encoder quality of the recompressed avatars.
+    AVATAR_MAX_BYTES (int): Largest accepted avatar upload in bytes.
+    AVATAR_MAX_PIXELS (int): Largest accepted avatar resolution (width x height) in pixels.
+    RATE_LIMIT_ENABLED (bool): Enforce the rate limits at all.
+    RATE_LIMIT_DEFAULT (str): Budget of routes without their own entry in RATE_LIMITS, e.g. "10/minute".
+    RATE_LIMITS (list): Per-route budgets as "name=budget" entries, e.g. "contacts.read=120/minute".
+    RATE_LIMIT_PROXY_HOPS (int): Reverse proxies in front of the app whose X-Forwarded-For entries are trusted.
+        Defaults to 0; deployments behind a reverse proxy must set it to the number of proxies.
+    RATE_LIMIT_MAX_KEYS (int): Buckets kept by the in-process limiter used when Redis is not available.
+    METRICS_TOKEN (str): Bearer token required by the /api/metrics/ endpoints; empty disables them.
+
+Note:
+    Make sure to provide valid Cloudinary API credentials to use the Cloudinary services.
+
+Example:
+    To use these configurations in other modules, you can import them like this:
+
+    >>> from .config import CLOUDINARY_API_KEY, CLOUDINARY_API_SECRET, CLOUDINARY_CLOUD_NAME
+"""
+
+from decouple import config, Choices, Csv
+
+CLOUDINARY_API_KEY = config('CLOUDINARY_API_KEY')
+CLOUDINARY_API_SECRET = config('CLOUDINARY_API_SECRET')
+CLOUDINARY_CLOUD_NAME = config('CLOUDINARY_CLOUD_NAME')
+
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=5, cast=int)
+DB_MAX_OVERFLOW = config('DB_MAX_OVERFLOW', default=10, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=30, cast=float)
+DB_POOL_RECYCLE = config('DB_POOL_RECYCLE', default=1800, cast=int)
+DB_POOL_PRE_PING = config('DB_POOL_PRE_PING', default=True, cast=bool)
+QUERY_SLOW_MS = config('QUERY_SLOW_MS', default=200, cast=float)
+
+CONTACT_IMPORT_BATCH_SIZE = config('CONTACT_IMPORT_BATCH_SIZE', default=1000, cast=int)
+CONTACT_EXPORT_BATCH_SIZE = config('CONTACT_EXPORT_BATCH_SIZE', default=1000, cast=int)
+CONTACT_BATCH_MAX_IDS = config('CONTACT_BATCH_MAX_IDS', default=10000, cast=int)
+CONTACT_FAST_JSON = config('CONTACT_FAST_JSON', default=False, cast=bool)
+SEARCH_INDEX_MAX_OWNERS = config('SEARCH_INDEX_MAX_OWNERS', default=1000, cast=int)
+
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_TTL = config('CACHE_TTL', default=60, cast=int)
+CACHE_MAX_ENTRIES = config('CACHE_MAX_ENTRIES', default=1024, cast=int)
+
+AUTH_CACHE_TTL = config('AUTH_CACHE_TTL', default=300, cast=int)
+AUTH_CACHE_MAX_ENTRIES = config('AUTH_CACHE_MAX_ENTRIES', default=10000, cast=int)
+
+PASSWORD_SCHEMES = config('PASSWORD_SCHEMES', default='argon2,bcrypt', cast=Csv())
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int)
+PASSWORD_BCRYPT_ROUNDS = config('PASSWORD_BCRYPT_ROUNDS', default=12, cast=int)
+PASSWORD_HASH_EXECUTOR = config('PASSWORD_HASH_EXECUTOR', default='thread', cast=Choices(['thread', 'process']))
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=4, cast=int)
+
+MAIL_SERVER = config('MAIL_SERVER', default='smtp.gmail.com')
+MAIL_PORT = config('MAIL_PORT', default=587, cast=int)
+MAIL_USERNAME = config('MAIL_USERNAME', default='')
+MAIL_PASSWORD = config('MAIL_PASSWORD', default='')
+MAIL_FROM = config('MAIL_FROM', default=MAIL_USERNAME)
+MAIL_STARTTLS = config('MAIL_STARTTLS', default=True, cast=bool)
+MAIL_SSL_TLS = config('MAIL_SSL_TLS', default=False, cast=bool)
+MAIL_TIMEOUT = config('MAIL_TIMEOUT', default=10.0, cast=float)
+MAIL_QUEUE_SIZE = config('MAIL_QUEUE_SIZE', default=10000, cast=int)
+MAIL_WORKERS = config('MAIL_WORKERS', default=4, cast=int)
+MAIL_BATCH_SIZE = config('MAIL_BATCH_SIZE', default=50, cast=int)
+MAIL_IDLE_TIMEOUT = config('MAIL_IDLE_TIMEOUT', default=30.0, cast=float)
+MAIL_MAX_ATTEMPTS = config('MAIL_MAX_ATTEMPTS', default=5, cast=int)
+MAIL_RETRY_BACKOFF = config('MAIL_RETRY_BACKOFF', default=2.0, cast=float)
+MAIL_RETRY_BACKOFF_MAX = config('MAIL_RETRY_BACKOFF_MAX', default=300.0, cast=float)
+MAIL_DEAD_LETTER_SIZE = config('MAIL_DEAD_LETTER_SIZE', default=1000, cast=int)
+
+AVATAR_STORAGE = config('AVATAR_STORAGE', default='cloudinary', cast=Choices(['cloudinary', 'local']))
+AVATAR_LOCAL_DIR = config('AVATAR_LOCAL_DIR', default='media/avatars')
+AVATAR_LOCAL_URL = config('AVATAR_LOCAL_URL', default='/media/avatars')
+AVATAR_SIZES = config('AVATAR_SIZES', default='256,64', cast=Csv(int))
+AVATAR_FORMAT = config('AVATAR_FORMAT', default='WEBP')
+AVATAR_QUALITY = config('AVATAR_QUALITY', default=85, cast=int)
+AVATAR_MAX_BYTES = config('AVATAR_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+AVATAR_MAX_PIXELS = config('AVATAR_MAX_PIXELS', default=40_000_000, cast=int)
+
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMIT_DEFAULT = config('RATE_LIMIT_DEFAULT', default='10/minute')
+RATE_LIMITS = config('RATE_LIMITS', default='', cast=Csv())
+# Без проксі X-Forwarded-For пише сам клієнт, тож за замовчуванням йому не довіряємо
+RATE_LIMIT_PROXY_HOPS = config('RATE_LIMIT_PROXY_HOPS', default=0, cast=int)
+RATE_LIMIT_MAX_KEYS = config('RATE_LIMIT_MAX_KEYS', default=100000, cast=int)
+
+# Метрики описують увесь сервіс, а не одного користувача, тому доступні лише за окремим токеном
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+"""
+CLOUDINARY_API_KEY = 'your-cloudinary-api-key'
+CLOUDINARY_API_SECRET = 'your-cloudinary-api-secret'
+CLOUDINARY_CLOUD_NAME = 'your-cloudinary-cloud-name'
 """
\ No newline at end of file
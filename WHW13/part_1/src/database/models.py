@@ -1,73 +1,109 @@
-"""
-Database Models Module
-
-This module defines SQLAlchemy models for the database tables used in the application.
-
-Classes:
-    Contact (Base): Represents a contact in the database with details such as name, email, and phone number.
-    Tag (Base): Represents a tag associated with contacts.
-    User (Base): Represents a user with email, hashed password, and related contacts.
-    PasswordResetToken (Base): Represents a token for resetting user passwords.
-
-Note:
-    This module defines the database models that are used to structure the data in the application.
-"""
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, func, BooleanDefaultFalse
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql.schema import ForeignKey
-from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy.sql import func
-from sqlalchemy.ext.declarative import declarative_base
-from datetime import timedelta
-
-from .db import Base
-
-class Contact(Base):
-    """Represents a contact in the database."""
-    __tablename__ = "contacts"
-    id = Column(Integer, primary_key=True, index=True)
-    first_name = Column(String, index=True, nullable=False)
-    last_name = Column(String, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
-    phone_number = Column(String, index=True, nullable=False)
-    birthday = Column(Date)
-    additional_data = Column(String)
-
-    # Зв'язок з тегами (якщо вам потрібно)
-    # tags = relationship("Tag", secondary=contact_m2m_tag, back_populates="contacts")
-
-class Tag(Base):
-    """Represents a tag associated with contacts."""
-    __tablename__ = "tags"
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, unique=True, index=True, nullable=False)
-
-    # Зв'язок з контактами (якщо вам потрібно)
-    # contacts = relationship("Contact", secondary=contact_m2m_tag, back_populates="tags")
-
-class User(Base):
-    """Represents a user with email, hashed password, and related contacts."""
-    __tablename__ = "users"
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True)
-    hashed_password = Column(String)
-    contacts = relationship("Contact", back_populates="owner")
-    verified = Column(BooleanDefaultFalse)
-    avatar_url = Column(String)
-
-    def set_password(self, password):
-        """Sets the hashed password for the user."""
-        self.hashed_password = generate_password_hash(password)
-
-    def check_password(self, password):
-        """Checks if the provided password matches the hashed password of the user."""
-        return check_password_hash(self.hashed_password, password)
-    
-class PasswordResetToken(Base):
-    """Represents a token for resetting user passwords."""
-    __tablename__ = "password_reset_tokens"
-
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token = Column(String, unique=True, index=True)
+"""
+Database Models Module
+
+This module defines SQLAlchemy models for the database tables used in the application.
+
+Classes:
+    Contact (Base): Represents a contact in the database with details such as name, email, and phone number.
+    Tag (Base): Represents a tag associated with contacts.
+    User (Base): Represents a user with email, hashed password, and related contacts.
+    PasswordResetToken (Base): Represents a token for resetting user passwords.
+
+Note:
+    This module defines the database models that are used to structure the data in the application.
+"""
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, func, Boolean, Index
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.sql.schema import ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.ext.declarative import declarative_base
+from datetime import date, timedelta
+from typing import Optional
+
+from .db import Base
+from ..services import passwords
+
+
+def birthday_key(birthday: Optional[date]) -> Optional[int]:
+    """Pack the month and day of a birthday as MMDD, e.g. 1990-03-07 -> 307."""
+    return birthday.month * 100 + birthday.day if birthday else None
+
+
+class Contact(Base):
+    """Represents a contact in the database."""
+    __tablename__ = "contacts"
+    id = Column(Integer, primary_key=True, index=True)
+    # Власник контакту; кожен запит до контактів фільтрується за ним
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", name="fk_contacts_owner_id_users"), nullable=False)
+    first_name = Column(String, index=True, nullable=False)
+    last_name = Column(String, index=True, nullable=False)
+    email = Column(String, nullable=False)
+    phone_number = Column(String, index=True, nullable=False)
+    birthday = Column(Date)
+    # Місяць і день народження (MMDD) для вибірки найближчих днів народження
+    birthday_md = Column(Integer)
+    additional_data = Column(String)
+    # Версія і час зміни — валідатори для ETag/Last-Modified (див. services/conditional.py)
+    version = Column(Integer, nullable=False, server_default="1")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    owner = relationship("User", back_populates="contacts")
+
+    # Усі індекси починаються з owner_id: запит одного користувача читає лише його діапазон,
+    # скільки б інших користувачів не було в таблиці
+    __table_args__ = (
+        Index("ix_contacts_owner_id_id", "owner_id", "id"),
+        # Також ключ keyset-пагінації за прізвищем (див. services/pagination.py)
+        Index("ix_contacts_owner_id_last_name", "owner_id", "last_name", "id"),
+        Index("ix_contacts_owner_id_birthday_md", "owner_id", "birthday_md"),
+        # Email унікальний у межах контактів одного користувача
+        Index("ix_contacts_owner_id_email", "owner_id", "email", unique=True),
+    )
+    # version збільшується при кожному flush; eager_defaults повертає updated_at через RETURNING
+    __mapper_args__ = {"version_id_col": version, "eager_defaults": True}
+
+    @validates("birthday")
+    def _sync_birthday_md(self, key, birthday):
+        """Keep `birthday_md` in step with every assignment to `birthday`."""
+        self.birthday_md = birthday_key(birthday)
+        return birthday
+
+    # Зв'язок з тегами (якщо вам потрібно)
+    # tags = relationship("Tag", secondary=contact_m2m_tag, back_populates="contacts")
+
+class Tag(Base):
+    """Represents a tag associated with contacts."""
+    __tablename__ = "tags"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+
+    # Зв'язок з контактами (якщо вам потрібно)
+    # contacts = relationship("Contact", secondary=contact_m2m_tag, back_populates="tags")
+
+class User(Base):
+    """Represents a user with email, hashed password, and related contacts."""
+    __tablename__ = "users"
+    id = Column(Integer, primary_key=True, index=True)
+    email = Column(String, unique=True, index=True)
+    hashed_password = Column(String)
+    # Контакти видаляє сама база (ON DELETE CASCADE), без завантаження їх у сесію
+    contacts = relationship("Contact", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    verified = Column(Boolean, default=False)
+    avatar_url = Column(String)
+
+    def set_password(self, password):
+        """Sets the hashed password for the user."""
+        self.hashed_password = passwords.hash_password_sync(password)
+
+    def check_password(self, password):
+        """Checks if the provided password matches the hashed password of the user."""
+        return passwords.verify_password_sync(password, self.hashed_password)[0]
+    
+class PasswordResetToken(Base):
+    """Represents a token for resetting user passwords."""
+    __tablename__ = "password_reset_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    token = Column(String, unique=True, index=True)
     expires_at = Column(DateTime, default=func.now() + timedelta(hours=1))
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Connection Pool Metrics Module
+
+This module collects connection pool statistics from SQLAlchemy pool events so that
+pool exhaustion can be observed instead of guessed.
+
+Classes:
+    PoolMetrics: Counters and wait-time statistics for the pool of a single engine.
+
+Note:
+    SQLAlchemy has no event for "started waiting for a connection", so wait time is measured by
+    a subclass of the engine's pool class that times `_do_get` (see `PoolMetrics.pool_class`).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event, exc
+
+
+class PoolMetrics:
+    """Counters and wait-time statistics for the pool of a single engine."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def pool_class(self, base: type) -> type:
+        """Return a subclass of the pool class `base` that reports its checkout wait time here."""
+        metrics = self
+
+        class TimedPool(base):
+            def _do_get(self):
+                with metrics.timed_checkout():
+                    return super()._do_get()
+
+        TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{base.__name__}"
+        return TimedPool
+
+    def attach(self, engine) -> "PoolMetrics":
+        """Subscribe to the pool events of `engine` (a sync `Engine` or an `AsyncEngine`)."""
+        engine = getattr(engine, "sync_engine", engine)
+        self.pool = engine.pool
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        return self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    @contextmanager
+    def timed_checkout(self):
+        """Measure the time spent waiting for a pooled connection inside the `with` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        except exc.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        """Return the current counters together with the live pool gauges."""
+        with self._lock:
+            data = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": self.wait_total / self.wait_count * 1000 if self.wait_count else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+        # QueuePool надає розмір і переповнення; StaticPool/SingletonThreadPool — ні
+        for gauge in ("size", "checkedout", "overflow", "checkedin"):
+            method = getattr(self.pool, gauge, None)
+            data[gauge] = method() if callable(method) else None
+        return data
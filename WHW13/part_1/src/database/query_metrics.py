@@ -0,0 +1,223 @@
+"""
+Query Metrics Module
+
+This module measures database access at two levels so that slow queries in production can be
+found from the metrics endpoint instead of guessed:
+
+* every repository call decorated with `QueryMetrics.instrument` records its duration, the number
+  of rows it returned and the number of SQL statements it executed;
+* every HTTP request passing through `QueryCountMiddleware` records the number of SQL statements
+  it executed, per route.
+
+Classes:
+    Histogram: Cumulative bucket counts, sum and maximum of observed values.
+    QueryMetrics: Per-call and per-route statistics of the repository layer.
+    QueryCountMiddleware: ASGI middleware counting the SQL statements of each request.
+
+Note:
+    Statements are counted by a `before_cursor_execute` listener on the engines. The counters of
+    the current request and repository call live in a context variable, which asyncio tasks and
+    SQLAlchemy's greenlets inherit, so concurrent requests do not mix their counts.
+"""
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Sequence, Tuple
+
+from sqlalchemy import event
+
+from ..conf.config import QUERY_SLOW_MS
+
+logger = logging.getLogger(__name__)
+
+# Межі кошиків гістограм: мілісекунди виклику, рядки результату, SQL-запити
+DURATION_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50)
+
+
+class _Scope:
+    """Number of SQL statements executed within one request or repository call."""
+
+    __slots__ = ("queries",)
+
+    def __init__(self):
+        self.queries = 0
+
+
+# Лічильники поточного запиту та виклику репозиторію (вкладені області рахуються всі)
+_scopes: ContextVar[Tuple[_Scope, ...]] = ContextVar("query_scopes", default=())
+
+
+@contextmanager
+def counting() -> Iterator[_Scope]:
+    """Count the SQL statements executed inside the `with` block."""
+    scope = _Scope()
+    token = _scopes.set(_scopes.get() + (scope,))
+    try:
+        yield scope
+    finally:
+        _scopes.reset(token)
+
+
+def row_count(result: Any) -> int:
+    """Number of rows in the result of a repository call: length of a list, 0 for None, else 1."""
+    if result is None:
+        return 0
+    if isinstance(result, bool):
+        return int(result)
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and maximum of observed values (not thread-safe by itself)."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * len(self.bounds)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def snapshot(self) -> dict:
+        """Return the count, sum, maximum and cumulative buckets ("le" bounds, as in Prometheus)."""
+        buckets, running = {}, 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            buckets[f"{bound:g}"] = running
+        buckets["+Inf"] = self.count
+        return {"count": self.count, "sum": self.total, "max": self.max, "buckets": buckets}
+
+
+class _CallStats:
+    def __init__(self):
+        self.errors = 0
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.rows = Histogram(ROW_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+
+    def snapshot(self) -> dict:
+        return {
+            "errors": self.errors,
+            "duration_ms": self.duration_ms.snapshot(),
+            "rows": self.rows.snapshot(),
+            "queries": self.queries.snapshot(),
+        }
+
+
+class QueryMetrics:
+    """Per-call and per-route statistics of the repository layer."""
+
+    def __init__(self):
+        self.statements = 0
+        self._calls: Dict[str, _CallStats] = {}
+        self._requests: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine) -> "QueryMetrics":
+        """Count the statements executed by `engine` (a sync `Engine` or an `AsyncEngine`)."""
+        event.listen(getattr(engine, "sync_engine", engine), "before_cursor_execute", self._on_execute)
+        return self
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Лічильники належать одному запиту чи виклику, тож їх змінює лише власний контекст
+        for scope in _scopes.get():
+            scope.queries += 1
+        with self._lock:
+            self.statements += 1
+
+    def instrument(self, name: str, rows: Callable[[Any], int] = row_count) -> Callable:
+        """
+        Decorate a repository coroutine to record its duration, returned rows and statements.
+
+        Args:
+            name (str): Name of the call in the metrics, e.g. "contacts.list".
+            rows (Callable): Counts the rows in the coroutine's result.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                with counting() as scope:
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception:
+                        self.record_call(name, time.perf_counter() - started, scope.queries, 0, failed=True)
+                        raise
+                self.record_call(name, time.perf_counter() - started, scope.queries, rows(result))
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def record_call(self, name: str, seconds: float, queries: int, rows: int, failed: bool = False) -> None:
+        """Record one repository call; calls slower than `QUERY_SLOW_MS` are also logged."""
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            stats = self._calls.get(name)
+            if stats is None:
+                stats = self._calls[name] = _CallStats()
+            stats.duration_ms.observe(elapsed_ms)
+            stats.queries.observe(queries)
+            if failed:
+                stats.errors += 1
+            else:
+                stats.rows.observe(rows)
+        if elapsed_ms >= QUERY_SLOW_MS:
+            logger.warning("Slow repository call %s: %.1f ms, %d queries, %d rows", name, elapsed_ms, queries, rows)
+
+    def record_request(self, route: str, queries: int) -> None:
+        """Record the number of statements executed by one request to `route`."""
+        with self._lock:
+            histogram = self._requests.get(route)
+            if histogram is None:
+                histogram = self._requests[route] = Histogram(QUERY_BUCKETS)
+            histogram.observe(queries)
+
+    def snapshot(self) -> dict:
+        """Return the statistics of every repository call and the statements per request of every route."""
+        with self._lock:
+            return {
+                "statements": self.statements,
+                "calls": {name: stats.snapshot() for name, stats in sorted(self._calls.items())},
+                "requests": {route: histogram.snapshot() for route, histogram in sorted(self._requests.items())},
+            }
+
+
+class QueryCountMiddleware:
+    """ASGI middleware recording the SQL statements of each HTTP request in `QueryMetrics`."""
+
+    def __init__(self, app, metrics: QueryMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Рахуємо до кінця відповіді, тож потокові відповіді (експорт) враховуються повністю
+        with counting() as counter:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                # FastAPI кладе знайдений маршрут у scope; шаблон шляху не розмножує ключі за id
+                route = scope.get("route")
+                if route is not None:
+                    self.metrics.record_request(f"{scope['method']} {route.path}", counter.queries)
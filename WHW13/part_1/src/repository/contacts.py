@@ -1,119 +1,305 @@
-"""
-Contacts API Router
-
-This module defines the FastAPI router for managing contacts.
-
-Routes:
-    POST /contacts/: Create a new contact.
-    GET /contacts/: Get a list of all contacts.
-    GET /contacts/{contact_id}: Get details of a specific contact.
-    PUT /contacts/{contact_id}: Update details of a specific contact.
-    DELETE /contacts/{contact_id}: Delete a specific contact.
-    GET /contacts/search/: Search for contacts based on query.
-    GET /contacts/birthday/: Get contacts with upcoming birthdays.
-
-Note:
-    This module contains API endpoints to create, retrieve, update, and delete contacts, as well as
-    search for contacts and retrieve contacts with upcoming birthdays.
-"""
-
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timedelta
-
-from ..database import db
-from ..schemas import ContactCreate, ContactUpdate, ContactResponse, ContactListResponse, ContactSearchResponse
-from ..database.models import Contact
-
-
-router = APIRouter()
-
-
-@router.post("/contacts/", response_model=ContactResponse)
-def create_contact(contact: ContactCreate, db: Session = Depends(db.get_db)):
-    """Create a new contact."""
-    db_contact = Contact(**contact.dict())
-    db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
-
-
-@router.get("/contacts/", response_model=List[ContactListResponse])
-def get_all_contacts(skip: int = 0, limit: int = 10, db: Session = Depends(db.get_db)):
-    """Get a list of all contacts."""
-    contacts = db.query(Contact).offset(skip).limit(limit).all()
-    return contacts
-
-
-@router.get("/contacts/{contact_id}", response_model=ContactResponse)
-def get_contact(contact_id: int, db: Session = Depends(db.get_db)):
-    """Get details of a specific contact."""
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
-
-
-@router.put("/contacts/{contact_id}", response_model=ContactResponse)
-def update_contact(contact_id: int, contact: ContactUpdate, db: Session = Depends(db.get_db)):
-    """Update details of a specific contact."""
-    db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not db_contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    for key, value in contact.dict().items():
-        setattr(db_contact, key, value)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
-
-
-@router.delete("/contacts/{contact_id}")
-def delete_contact(contact_id: int, db: Session = Depends(db.get_db)):
-    """Delete a specific contact."""
-    db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not db_contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    db.delete(db_contact)
-    db.commit()
-    return {"message": "Contact deleted"}
-
-
-@router.get("/contacts/search/", response_model=List[ContactSearchResponse])
-def search_contacts(query: Optional[str] = None, db: Session = Depends(db.get_db)):
-    """Search for contacts based on query."""
-    if query:
-        contacts = db.query(Contact).filter(
-            Contact.first_name.ilike(f"%{query}%") |
-            Contact.last_name.ilike(f"%{query}%") |
-            Contact.email.ilike(f"%{query}%")
-        ).all()
-    else:
-        contacts = db.query(Contact).all()
-    return contacts
-
-
-@router.get("/contacts/birthday/", response_model=List[ContactSearchResponse])
-def upcoming_birthdays(db: Session = Depends(db.get_db)):
-    """Get contacts with upcoming birthdays."""
-    today = datetime.now()
-    next_week = today + timedelta(days=7)
-    contacts = db.query(Contact).filter(
-        Contact.birthday >= today.date(),
-        Contact.birthday <= next_week.date()
-    ).all()
-    return contacts
-
-@router.get("/contacts/search/", response_model=List[ContactSearchResponse])
-def search_contacts(query: Optional[str] = None, db: Session = Depends(db.get_db)):
-    """Search for contacts based on query."""
-    if query:
-        contacts = db.query(Contact).filter(
-            Contact.first_name.ilike(f"%{query}%") |
-            Contact.last_name.ilike(f"%{query}%") |
-            Contact.email.ilike(f"%{query}%")
-        ).all()
-    else:
-        contacts = db.query(Contact).all()
-    return contacts
+"""
+Contacts Repository
+
+This module provides the database operations on contacts. The routes in `src.routes.contacts`
+call into it and keep only the HTTP concerns (validation, caching, validators, status codes).
+
+Every function is scoped to the contacts of one owner and is instrumented with
+`query_metrics.instrument`, which records its duration, returned rows and executed statements
+(see `src.database.query_metrics` and the `/metrics/queries/` endpoint).
+
+Functions:
+    create_contact(db: AsyncSession, owner_id: int, values: dict) -> Contact:
+        Insert a new contact.
+
+    list_contacts(db: AsyncSession, owner_id: int, skip: int, limit: int, columns: Optional[Sequence] = None) -> List:
+        Get contacts ordered by id.
+
+    contacts_page(db: AsyncSession, owner_id: int, order_by: str, limit: int, cursor: Optional[str] = None,
+                  only: Optional[Sequence] = None) -> Tuple[List[Contact], Optional[str]]:
+        Get a page of contacts using keyset (cursor) pagination.
+
+    get_contact(db: AsyncSession, owner_id: int, contact_id: int, only: Optional[Sequence] = None) -> Optional[Contact]:
+        Get a contact by ID.
+
+    contact_exists(db: AsyncSession, owner_id: int, contact_id: int) -> bool:
+        Tell whether a contact exists.
+
+    update_contact(db: AsyncSession, owner_id: int, contact_id: int, changes: dict,
+                   version: Optional[int] = None) -> Optional[Contact]:
+        Change one contact with a single UPDATE ... RETURNING.
+
+    update_selected(db: AsyncSession, owner_id: int, selection: ContactSelection, changes: dict) -> List[Contact]:
+        Change every selected contact with a single UPDATE ... RETURNING.
+
+    delete_contact(db: AsyncSession, owner_id: int, contact_id: int) -> bool:
+        Delete a contact.
+
+    delete_selected(db: AsyncSession, owner_id: int, selection: ContactSelection) -> List[int]:
+        Delete every selected contact with a single DELETE ... RETURNING.
+
+    search_contacts(db: AsyncSession, owner_id: int, query: Optional[str], limit: int,
+                    columns: Optional[Sequence] = None) -> List:
+        Search contacts, best matches first.
+
+    upcoming_birthdays(db: AsyncSession, owner_id: int, today: date, days: int,
+                       columns: Optional[Sequence] = None) -> List:
+        Get contacts whose birthday falls within the next `days` days, soonest first.
+
+Note:
+    Functions taking `columns` return rows of exactly those columns instead of `Contact` objects;
+    `only` loads `Contact` objects with just those columns (`load_only`).
+    Write functions commit and keep the search index in step. On IntegrityError they roll back
+    and re-raise it; translating it into a response is left to the caller.
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from ..database.db import query_metrics
+from ..database.models import Contact, birthday_key
+from ..schemas import ContactSelection
+from ..services import search
+from ..services.pagination import CONTACT_ORDERINGS, encode_cursor, paginate_contacts
+
+
+def selection_clause(selection: ContactSelection, owner_id: int):
+    """Build the WHERE clause matching the contacts of a batch selection among those of `owner_id`."""
+    conditions = [Contact.owner_id == owner_id]
+    if selection.ids:
+        conditions.append(Contact.id.in_(selection.ids))
+    contact_filter = selection.filter
+    if contact_filter is not None:
+        if contact_filter.last_name is not None:
+            conditions.append(Contact.last_name == contact_filter.last_name)
+        if contact_filter.email_domain:
+            domain = "@" + contact_filter.email_domain.lower()
+            conditions.append(func.lower(Contact.email).endswith(domain, autoescape=True))
+        if contact_filter.birthday_from is not None:
+            conditions.append(Contact.birthday >= contact_filter.birthday_from)
+        if contact_filter.birthday_to is not None:
+            conditions.append(Contact.birthday <= contact_filter.birthday_to)
+    return and_(*conditions)
+
+
+def contact_values(changes: dict) -> dict:
+    """Column values for a bulk UPDATE of contacts, which bypasses the validators of the model."""
+    values = dict(changes)
+    # Масовий UPDATE не чіпає version_id_col, тому версію збільшуємо явно
+    values["version"] = Contact.version + 1
+    if "birthday" in values:
+        values["birthday_md"] = birthday_key(values["birthday"])
+    return values
+
+
+@query_metrics.instrument("contacts.create")
+async def create_contact(db: AsyncSession, owner_id: int, values: dict) -> Contact:
+    """Insert a new contact of `owner_id`; raises IntegrityError for a duplicate email."""
+    contact = Contact(**values, owner_id=owner_id)
+    db.add(contact)
+    # id присвоюється під час INSERT, решта полів уже відома — refresh не потрібен
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    search.contact_index.add_contact(contact)
+    return contact
+
+
+@query_metrics.instrument("contacts.list")
+async def list_contacts(
+    db: AsyncSession,
+    owner_id: int,
+    skip: int,
+    limit: int,
+    columns: Optional[Sequence] = None,
+) -> List:
+    """Get contacts of `owner_id` ordered by id, as `Contact` objects or rows of `columns`."""
+    stmt = select(*columns) if columns else select(Contact)
+    # Порядок за (owner_id, id) береться з індексу ix_contacts_owner_id_id без сортування
+    stmt = stmt.where(Contact.owner_id == owner_id).order_by(Contact.id).offset(skip).limit(limit)
+    if columns:
+        return (await db.execute(stmt)).all()
+    return (await db.scalars(stmt)).all()
+
+
+@query_metrics.instrument("contacts.page", rows=lambda page: len(page[0]))
+async def contacts_page(
+    db: AsyncSession,
+    owner_id: int,
+    order_by: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    only: Optional[Sequence] = None,
+) -> Tuple[List[Contact], Optional[str]]:
+    """
+    Get a page of contacts of `owner_id` using keyset (cursor) pagination.
+
+    Returns:
+        Tuple[List[Contact], Optional[str]]: The contacts and the cursor of the next page, if any.
+    """
+    ordering = CONTACT_ORDERINGS[order_by]
+    stmt = select(Contact).where(Contact.owner_id == owner_id)
+    if only:
+        # Колонки ключа сортування потрібні для курсора, навіть якщо їх не повертаємо
+        stmt = stmt.options(load_only(*only, *ordering))
+    contacts = (await db.scalars(paginate_contacts(stmt, order_by, limit, cursor))).all()
+    if len(contacts) <= limit:
+        return contacts, None
+    contacts = contacts[:limit]
+    return contacts, encode_cursor(order_by, tuple(getattr(contacts[-1], column.key) for column in ordering))
+
+
+@query_metrics.instrument("contacts.get")
+async def get_contact(
+    db: AsyncSession,
+    owner_id: int,
+    contact_id: int,
+    only: Optional[Sequence] = None,
+) -> Optional[Contact]:
+    """Get a contact of `owner_id` by ID; None if there is no such contact."""
+    stmt = select(Contact).where(Contact.owner_id == owner_id, Contact.id == contact_id)
+    if only:
+        stmt = stmt.options(load_only(*only))
+    return await db.scalar(stmt)
+
+
+@query_metrics.instrument("contacts.exists")
+async def contact_exists(db: AsyncSession, owner_id: int, contact_id: int) -> bool:
+    """Tell whether `owner_id` has a contact with this ID."""
+    stmt = select(Contact.id).where(Contact.owner_id == owner_id, Contact.id == contact_id)
+    return await db.scalar(stmt) is not None
+
+
+@query_metrics.instrument("contacts.update")
+async def update_contact(
+    db: AsyncSession,
+    owner_id: int,
+    contact_id: int,
+    changes: dict,
+    version: Optional[int] = None,
+) -> Optional[Contact]:
+    """
+    Set `changes` on one contact of `owner_id` with a single UPDATE ... RETURNING.
+
+    With `version` given, the contact is only updated if it still has that version (If-Match).
+
+    Returns:
+        Optional[Contact]: The updated contact; None if no contact matched the ID (and version).
+    """
+    condition = and_(Contact.owner_id == owner_id, Contact.id == contact_id)
+    if version is not None:
+        condition = and_(condition, Contact.version == version)
+    stmt = (
+        update(Contact)
+        .where(condition)
+        .values(**contact_values(changes))
+        .returning(Contact)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        contact = await db.scalar(stmt)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    if contact is not None:
+        search.contact_index.add_contact(contact)
+    return contact
+
+
+@query_metrics.instrument("contacts.update_selected")
+async def update_selected(
+    db: AsyncSession,
+    owner_id: int,
+    selection: ContactSelection,
+    changes: dict,
+) -> List[Contact]:
+    """Set `changes` on every selected contact of `owner_id` with a single UPDATE ... RETURNING."""
+    stmt = (
+        update(Contact)
+        .where(selection_clause(selection, owner_id))
+        .values(**contact_values(changes))
+        .returning(Contact)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        contacts = (await db.scalars(stmt)).all()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    for contact in contacts:
+        search.contact_index.add_contact(contact)
+    return contacts
+
+
+@query_metrics.instrument("contacts.delete")
+async def delete_contact(db: AsyncSession, owner_id: int, contact_id: int) -> bool:
+    """Delete a contact of `owner_id`; False if there was no such contact."""
+    stmt = delete(Contact).where(Contact.owner_id == owner_id, Contact.id == contact_id).returning(Contact.id)
+    if await db.scalar(stmt) is None:
+        return False
+    await db.commit()
+    search.contact_index.remove_contact(owner_id, contact_id)
+    return True
+
+
+@query_metrics.instrument("contacts.delete_selected")
+async def delete_selected(db: AsyncSession, owner_id: int, selection: ContactSelection) -> List[int]:
+    """Delete every selected contact of `owner_id` with a single DELETE ... RETURNING; return their ids."""
+    stmt = (
+        delete(Contact)
+        .where(selection_clause(selection, owner_id))
+        .returning(Contact.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = (await db.scalars(stmt)).all()
+    await db.commit()
+    for contact_id in deleted:
+        search.contact_index.remove_contact(owner_id, contact_id)
+    return deleted
+
+
+@query_metrics.instrument("contacts.search")
+async def search_contacts(
+    db: AsyncSession,
+    owner_id: int,
+    query: Optional[str],
+    limit: int,
+    columns: Optional[Sequence] = None,
+) -> List:
+    """Search contacts of `owner_id`, best matches first (see `services.search`)."""
+    return await search.search_contacts(db, owner_id, query, limit, columns=columns)
+
+
+@query_metrics.instrument("contacts.birthdays")
+async def upcoming_birthdays(
+    db: AsyncSession,
+    owner_id: int,
+    today: date,
+    days: int,
+    columns: Optional[Sequence] = None,
+) -> List:
+    """Get contacts of `owner_id` whose birthday falls within `days` days from `today`, soonest first."""
+    start = birthday_key(today)
+    end = birthday_key(today + timedelta(days=days))
+    stmt = select(*columns) if columns else select(Contact)
+    # Діапазон birthday_md у межах власника читається з індексу (owner_id, birthday_md)
+    stmt = stmt.where(Contact.owner_id == owner_id, Contact.birthday_md.is_not(None))
+    if days < 365:
+        if start <= end:
+            stmt = stmt.where(Contact.birthday_md.between(start, end))
+        else:
+            # Вікно переходить через Новий рік: кінець грудня + початок січня
+            stmt = stmt.where(or_(Contact.birthday_md >= start, Contact.birthday_md <= end))
+    stmt = stmt.order_by(case((Contact.birthday_md < start, 1), else_=0), Contact.birthday_md, Contact.id)
+    if columns:
+        return (await db.execute(stmt)).all()
+    return (await db.scalars(stmt)).all()
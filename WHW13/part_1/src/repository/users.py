@@ -1,19 +1,24 @@
-"""
-Users Repository
-
-This module provides database operations related to user management.
-
-Functions:
-    get_user_by_email(db: Session, email: str) -> User:
-        Retrieve a user based on their email.
-
-Note:
-    This module contains functions for retrieving user information from the database.
-"""
-
-from sqlalchemy.orm import Session
-from ..database.models import User
-
-def get_user_by_email(db: Session, email: str):
-    """Retrieve a user based on their email."""
-    return db.query(User).filter(User.email == email).first()
+"""
+Users Repository
+
+This module provides database operations related to user management.
+
+Functions:
+    get_user_by_email(db: AsyncSession, email: str) -> User:
+        Retrieve a user based on their email.
+
+Note:
+    This module contains functions for retrieving user information from the database.
+    Its calls are timed and counted by `query_metrics` like those of the contacts repository.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database.db import query_metrics
+from ..database.models import User
+
+@query_metrics.instrument("users.get_by_email")
+async def get_user_by_email(db: AsyncSession, email: str):
+    """Retrieve a user based on their email."""
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
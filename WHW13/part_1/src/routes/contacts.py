@@ -1,144 +1,426 @@
-"""
-Contacts Routes
-
-This module contains routes and functions related to managing contacts.
-
-Modules:
-    db: Database related functions.
-
-Functions:
-    create_contact(contact: ContactCreate, db: Session = Depends(db.get_db)) -> Contact:
-        Create a new contact.
-
-    get_all_contacts(skip: int = 0, limit: int = 10, db: Session = Depends(db.get_db)) -> List[Contact]:
-        Get a list of all contacts.
-
-    get_contact(contact_id: int, db: Session = Depends(db.get_db)) -> Contact:
-        Get a specific contact by ID.
-
-    update_contact(contact_id: int, contact: ContactUpdate, db: Session = Depends(db.get_db)) -> Contact:
-        Update a contact.
-
-    delete_contact(contact_id: int, db: Session = Depends(db.get_db)) -> dict:
-        Delete a contact.
-
-    search_contacts(query: Optional[str] = None, db: Session = Depends(db.get_db)) -> List[Contact]:
-        Search contacts based on a query.
-
-    upcoming_birthdays(db: Session = Depends(db.get_db)) -> List[Contact]:
-        Get contacts with upcoming birthdays.
-
-Endpoints:
-    /contacts:
-        POST: Create a new contact.
-        GET: Get a list of all contacts.
-
-    /contacts/{contact_id}:
-        GET: Get a specific contact by ID.
-        PUT: Update a contact.
-        DELETE: Delete a contact.
-
-    /contacts/search/:
-        GET: Search contacts based on a query.
-
-    /contacts/birthday/:
-        GET: Get contacts with upcoming birthdays.
-
-Note:
-    This module handles routes for creating, retrieving, updating, and deleting contacts,
-    as well as searching for contacts and retrieving upcoming birthdays.
-"""
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from fastapi_limiter import limiter, FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
-
-from datetime import datetime, timedelta
-
-from ..repository import contacts
-from ..database import db
-from ..database.models import Contact, User
-from ..schemas import ContactCreate, ContactUpdate, ContactResponse, ContactSearchResponse
-from ..routes.token import get_current_user_from_token
-
-
-router = APIRouter()
-
-@router.post("/contacts/", response_model=ContactResponse)
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def create_contact(contact: ContactCreate, db: Session = Depends(db.get_db)):
-    """Create a new contact."""
-    db_contact = Contact(**contact.dict())
-    db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
-
-@router.get("/contacts/", response_model=List[ContactResponse])
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def get_all_contacts(skip: int = 0, limit: int = 10, db: Session = Depends(db.get_db)):
-    """Get a list of all contacts."""
-    contacts = db.query(Contact).offset(skip).limit(limit).all()
-    return contacts
-
-@router.get("/contacts/{contact_id}", response_model=ContactResponse)
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def get_contact(contact_id: int, db: Session = Depends(db.get_db)):
-    """Get a specific contact by ID."""
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
-
-@router.put("/contacts/{contact_id}", response_model=ContactResponse)
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def update_contact(contact_id: int, contact: ContactUpdate, db: Session = Depends(db.get_db)):
-    """Update a specific contact by ID."""
-    db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not db_contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    for key, value in contact.dict().items():
-        setattr(db_contact, key, value)
-    db.commit()
-    db.refresh(db_contact)
-    return db_contact
-
-@router.delete("/contacts/{contact_id}")
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def delete_contact(contact_id: int, db: Session = Depends(db.get_db)):
-    """Delete a specific contact by ID."""
-    db_contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if not db_contact:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    db.delete(db_contact)
-    db.commit()
-    return {"message": "Contact deleted"}
-
-@router.get("/contacts/search/", response_model=List[ContactSearchResponse])
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def search_contacts(query: Optional[str] = None, db: Session = Depends(db.get_db)):
-    """Search contacts based on a query."""
-    if query:
-        contacts = db.query(Contact).filter(
-            Contact.first_name.ilike(f"%{query}%") |
-            Contact.last_name.ilike(f"%{query}%") |
-            Contact.email.ilike(f"%{query}%")
-        ).all()
-    else:
-        contacts = db.query(Contact).all()
-    return contacts
-
-@router.get("/contacts/birthday/", response_model=List[ContactSearchResponse])
-@limiter.limit("10 per minute")  # Додати обмеження до цього маршруту
-def upcoming_birthdays(db: Session = Depends(db.get_db)):
-    """Get contacts with upcoming birthdays."""
-    today = datetime.now()
-    next_week = today + timedelta(days=7)
-    contacts = db.query(Contact).filter(
-        Contact.birthday >= today.date(),
-        Contact.birthday <= next_week.date()
-    ).all()
-    return contacts
-
+"""
+Contacts Routes
+
+This module contains routes and functions related to managing contacts.
+
+Modules:
+    db: Database related functions.
+    contacts: Database operations on contacts (`src.repository.contacts`).
+
+Functions:
+    create_contact(contact: ContactCreate, response: Response, user: User, db: AsyncSession) -> Contact:
+        Create a new contact owned by the current user.
+
+    get_all_contacts(request: Request, response: Response, skip: int = 0, limit: int = 10, fields: Optional[str] = None,
+                     user: User, db: AsyncSession) -> List[Contact]:
+        Get a list of the current user's contacts.
+
+    get_contacts_page(response: Response, cursor: Optional[str] = None, limit: int = 10, order_by: str = "id",
+                      fields: Optional[str] = None, user: User, db: AsyncSession) -> ContactPage:
+        Get a page of contacts using keyset (cursor) pagination.
+
+    import_contacts(file: UploadFile, format: Optional[str] = None, user: User, db: AsyncSession) -> ContactImportResult:
+        Bulk-import contacts from an uploaded CSV or NDJSON file.
+
+    export_contacts(format: str = "csv", user: User) -> StreamingResponse:
+        Stream all of the current user's contacts as CSV or NDJSON.
+
+    batch_update_contacts(batch: ContactBatchUpdate, user: User, db: AsyncSession) -> List[Contact]:
+        Apply a partial update to every selected contact with a single UPDATE.
+
+    batch_delete_contacts(selection: ContactSelection, user: User, db: AsyncSession) -> ContactBatchDeleteResult:
+        Delete every selected contact with a single DELETE.
+
+    get_contact(contact_id: int, request: Request, response: Response, fields: Optional[str] = None,
+                user: User, db: AsyncSession) -> Contact:
+        Get a specific contact by ID.
+
+    update_contact(contact_id: int, contact: ContactUpdate, request: Request, response: Response,
+                   user: User, db: AsyncSession) -> Contact:
+        Replace all fields of a contact.
+
+    patch_contact(contact_id: int, changes: ContactPatch, request: Request, response: Response,
+                  user: User, db: AsyncSession) -> Contact:
+        Change only the given fields of a contact.
+
+    delete_contact(contact_id: int, user: User, db: AsyncSession) -> dict:
+        Delete a contact.
+
+    search_contacts(response: Response, query: Optional[str] = None, limit: int = 20, fields: Optional[str] = None,
+                    user: User, db: AsyncSession) -> List[Contact]:
+        Search contacts based on a query, best matches first.
+
+    upcoming_birthdays(response: Response, days: int = 7, fields: Optional[str] = None,
+                       user: User, db: AsyncSession) -> List[Contact]:
+        Get contacts whose birthday falls within the next `days` days, soonest first.
+
+Endpoints:
+    /contacts:
+        POST: Create a new contact.
+        GET: Get a list of all contacts (304 if `If-None-Match` matches the list's ETag).
+
+    /contacts/page/:
+        GET: Get a page of contacts with an opaque `next_cursor` for the following page.
+
+    /contacts/import/:
+        POST: Bulk-import contacts from a CSV or NDJSON upload, reporting rejected rows.
+
+    /contacts/export/:
+        GET: Stream all contacts as a CSV or NDJSON download.
+
+    /contacts/batch/:
+        PATCH: Update the contacts selected by ids and/or a filter, returning them.
+        DELETE: Delete the contacts selected by ids and/or a filter, returning their ids.
+
+    /contacts/{contact_id}:
+        GET: Get a specific contact by ID (304 if `If-None-Match` matches its ETag).
+        PUT: Replace all fields of a contact.
+        PATCH: Change only the fields present in the request body.
+        DELETE: Delete a contact.
+
+    /contacts/search/:
+        GET: Search contacts based on a query (ranked, at most `limit` results).
+
+    /contacts/birthday/:
+        GET: Get contacts with birthdays in the next `days` days (wraps across New Year).
+
+Note:
+    This module handles routes for creating, retrieving, updating, and deleting contacts,
+    as well as searching for contacts and retrieving upcoming birthdays.
+    All handlers are coroutines using an `AsyncSession`, so database waits do not
+    occupy the worker threadpool.
+    The handlers do not build queries themselves: all database access goes through the
+    instrumented functions of `src.repository.contacts`.
+    Single-contact, listing and birthday reads are served from `services.cache`; every write
+    invalidates the contacts cache namespace.
+    Every route requires an authenticated user (`get_current_user_from_token`) and only sees and
+    changes that user's contacts: each query filters on `owner_id`, which leads the composite
+    indexes of the contacts table, and the response cache and search index are kept per owner,
+    so a write by one user does not invalidate the cached reads of the others.
+    Writes to a single contact are one UPDATE ... RETURNING (or INSERT) per request: the response
+    is built from the returned row, without a SELECT before or a refresh after.
+    Single contacts and listings carry strong ETags, single contacts also `Last-Modified`
+    (see `services.conditional`).
+    PUT and PATCH honor `If-Match` and fail with 412 if the contact changed in the meantime.
+    With `CONTACT_FAST_JSON` the list, search and birthday endpoints select plain column rows and
+    serialize them with orjson, skipping response-model validation (see `services.serialization`).
+    The read routes accept `fields=` (e.g. `fields=first_name,phone_number`) to select a sparse
+    fieldset: only those columns are read from the database and returned, plus `id`.
+    Every route is rate limited by `services.rate_limit` with the budget of its group:
+    contacts.read, contacts.write, contacts.search, contacts.import or contacts.export.
+"""
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Tuple
+
+from datetime import datetime
+
+from ..repository import contacts
+from ..database import db
+from ..database.models import Contact, User
+from ..schemas import ContactCreate, ContactUpdate, ContactResponse, ContactSearchResponse, ContactPage, ContactImportResult
+from ..schemas import ContactPatch, ContactBatchUpdate, ContactSelection, ContactBatchDeleteResult
+from ..services import contact_import, contact_export
+from ..services.conditional import (
+    collection_etag,
+    contact_etag,
+    expected_version,
+    http_date,
+    not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from ..services.cache import response_cache
+from ..services.rate_limit import RateLimit
+from ..services.serialization import (
+    contact_dict,
+    contact_dicts,
+    contact_fields,
+    contacts_response,
+    field_columns,
+    fields_key,
+    fieldset_tag,
+)
+from ..conf.config import CONTACT_FAST_JSON
+from ..routes.token import get_current_user_from_token
+
+
+router = APIRouter()
+
+# Префікс просторів імен кешу читань контактів; у кожного власника свій простір,
+# тож запис одного користувача не скидає кеш інших
+CONTACTS_CACHE = "contacts"
+
+
+def contacts_cache(owner_id: int) -> str:
+    """Cache namespace of the contact reads of one owner."""
+    return f"{CONTACTS_CACHE}:{owner_id}"
+
+
+def contact_headers(contact: Contact) -> dict:
+    """ETag, Last-Modified and Cache-Control headers of a single contact."""
+    return validator_headers(contact_etag(contact), http_date(contact.updated_at))
+
+
+async def update_contact_row(
+    db: AsyncSession,
+    owner_id: int,
+    contact_id: int,
+    values: dict,
+    version: Optional[int] = None,
+) -> Contact:
+    """
+    Set `values` on one contact of `owner_id` and return it, translating failures into HTTP errors.
+
+    With `version` given, the contact is only updated if it still has that version (If-Match).
+    """
+    try:
+        db_contact = await contacts.update_contact(db, owner_id, contact_id, values, version)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Update conflicts with an existing contact")
+    if db_contact is None:
+        # Запит на існування лише у випадку невдачі: щасливий шлях лишається одним UPDATE
+        if version is not None and await contacts.contact_exists(db, owner_id, contact_id):
+            raise HTTPException(status_code=412, detail="Contact has been modified")
+        raise HTTPException(status_code=404, detail="Contact not found")
+    await response_cache.invalidate(contacts_cache(owner_id))
+    return db_contact
+
+
+@router.post("/contacts/", response_model=ContactResponse, dependencies=[Depends(RateLimit("contacts.write"))])
+async def create_contact(
+    contact: ContactCreate,
+    response: Response,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Create a new contact owned by the current user."""
+    try:
+        db_contact = await contacts.create_contact(db, user.id, contact.dict())
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Contact with this email already exists")
+    await response_cache.invalidate(contacts_cache(user.id))
+    response.headers.update(contact_headers(db_contact))
+    return db_contact
+
+@router.get("/contacts/", response_model=List[ContactResponse], dependencies=[Depends(RateLimit("contacts.read"))])
+async def get_all_contacts(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 10,
+    fields: Optional[Tuple[str, ...]] = Depends(contact_fields),
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Get a list of the current user's contacts."""
+    cache_key = f"list:{skip}:{limit}:{fields_key(fields)}"
+    cached = await response_cache.get(contacts_cache(user.id), cache_key)
+    if cached is None:
+        if CONTACT_FAST_JSON or fields:
+            columns = (*field_columns(fields), Contact.version, Contact.updated_at)
+            items = await contacts.list_contacts(db, user.id, skip, limit, columns)
+            body = contact_dicts(items, fields)
+        else:
+            items = await contacts.list_contacts(db, user.id, skip, limit)
+            body = [jsonable_encoder(ContactResponse.model_validate(contact)) for contact in items]
+        # Валідатор рахується разом із тілом і кешується поруч із ним. Last-Modified для списку
+        # не віддаємо: видалення контакту не збільшує max(updated_at), тож If-Modified-Since
+        # відповідав би 304 і клієнт лишав би собі видалений рядок
+        cached = {
+            "etag": collection_etag(items, fieldset_tag(fields)),
+            "body": body,
+        }
+        await response_cache.set(contacts_cache(user.id), cache_key, cached)
+    headers = validator_headers(cached["etag"], None)
+    if not_modified(request, cached["etag"], None):
+        return not_modified_response(headers, response)
+    response.headers.update(headers)
+    return contacts_response(cached["body"], response, sparse=bool(fields))
+
+@router.get("/contacts/page/", response_model=ContactPage, dependencies=[Depends(RateLimit("contacts.read"))])
+async def get_contacts_page(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    order_by: Literal["id", "last_name"] = "id",
+    fields: Optional[Tuple[str, ...]] = Depends(contact_fields),
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Get a page of the current user's contacts using keyset (cursor) pagination."""
+    only = field_columns(fields) if fields else None
+    items, next_cursor = await contacts.contacts_page(db, user.id, order_by, limit, cursor, only)
+    if fields:
+        page = {"items": [contact_dict(contact, fields) for contact in items], "next_cursor": next_cursor}
+        return contacts_response(page, response, sparse=True)
+    return ContactPage(items=[ContactResponse.model_validate(contact) for contact in items], next_cursor=next_cursor)
+
+@router.post("/contacts/import/", response_model=ContactImportResult, dependencies=[Depends(RateLimit("contacts.import"))])
+async def import_contacts(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Bulk-import contacts for the current user from an uploaded CSV or NDJSON file."""
+    fmt = format or contact_import.detect_format(file.filename, file.content_type)
+    result = await contact_import.import_contacts(db, user.id, contact_import.read_rows(file.file, fmt))
+    if result.inserted:
+        await response_cache.invalidate(contacts_cache(user.id))
+    return result
+
+@router.get("/contacts/export/", dependencies=[Depends(RateLimit("contacts.export"))])
+async def export_contacts(format: Literal["csv", "ndjson"] = "csv", user: User = Depends(get_current_user_from_token)):
+    """Stream all of the current user's contacts as CSV or NDJSON."""
+    return StreamingResponse(
+        contact_export.export_contacts(user.id, format),
+        media_type=contact_export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'},
+    )
+
+@router.patch("/contacts/batch/", response_model=List[ContactResponse], dependencies=[Depends(RateLimit("contacts.write"))])
+async def batch_update_contacts(
+    batch: ContactBatchUpdate,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Apply a partial update to every selected contact with a single UPDATE ... RETURNING."""
+    values = batch.changes.dict(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No changes given")
+    try:
+        updated = await contacts.update_selected(db, user.id, batch, values)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Update conflicts with an existing contact")
+    if updated:
+        await response_cache.invalidate(contacts_cache(user.id))
+    return updated
+
+@router.delete("/contacts/batch/", response_model=ContactBatchDeleteResult, dependencies=[Depends(RateLimit("contacts.write"))])
+async def batch_delete_contacts(
+    selection: ContactSelection,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Delete every selected contact with a single DELETE ... RETURNING."""
+    deleted = await contacts.delete_selected(db, user.id, selection)
+    if deleted:
+        await response_cache.invalidate(contacts_cache(user.id))
+    return ContactBatchDeleteResult(deleted=len(deleted), ids=deleted)
+
+@router.get("/contacts/{contact_id}", response_model=ContactResponse, dependencies=[Depends(RateLimit("contacts.read"))])
+async def get_contact(
+    contact_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(contact_fields),
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Get a specific contact of the current user by ID."""
+    cache_key = f"contact:{contact_id}:{fields_key(fields)}"
+    cached = await response_cache.get(contacts_cache(user.id), cache_key)
+    if cached is None:
+        only = (*field_columns(fields), Contact.version, Contact.updated_at) if fields else None
+        contact = await contacts.get_contact(db, user.id, contact_id, only)
+        if not contact:
+            raise HTTPException(status_code=404, detail="Contact not found")
+        cached = {
+            "etag": contact_etag(contact, fieldset_tag(fields)),
+            "last_modified": http_date(contact.updated_at),
+            "body": contact_dict(contact, fields) if fields else jsonable_encoder(ContactResponse.model_validate(contact)),
+        }
+        await response_cache.set(contacts_cache(user.id), cache_key, cached)
+    headers = validator_headers(cached["etag"], cached["last_modified"])
+    if not_modified(request, cached["etag"], cached["last_modified"]):
+        return not_modified_response(headers, response)
+    response.headers.update(headers)
+    return contacts_response(cached["body"], response, sparse=bool(fields))
+
+@router.put("/contacts/{contact_id}", response_model=ContactResponse, dependencies=[Depends(RateLimit("contacts.write"))])
+async def update_contact(
+    contact_id: int,
+    contact: ContactUpdate,
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Replace all fields of a specific contact by ID."""
+    version = expected_version(request, contact_id)
+    db_contact = await update_contact_row(db, user.id, contact_id, contact.dict(), version)
+    response.headers.update(contact_headers(db_contact))
+    return db_contact
+
+@router.patch("/contacts/{contact_id}", response_model=ContactResponse, dependencies=[Depends(RateLimit("contacts.write"))])
+async def patch_contact(
+    contact_id: int,
+    changes: ContactPatch,
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Change only the fields present in the request body; the other columns are not written."""
+    values = changes.dict(exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="No changes given")
+    version = expected_version(request, contact_id)
+    db_contact = await update_contact_row(db, user.id, contact_id, values, version)
+    response.headers.update(contact_headers(db_contact))
+    return db_contact
+
+@router.delete("/contacts/{contact_id}", dependencies=[Depends(RateLimit("contacts.write"))])
+async def delete_contact(
+    contact_id: int,
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Delete a specific contact of the current user by ID."""
+    if not await contacts.delete_contact(db, user.id, contact_id):
+        raise HTTPException(status_code=404, detail="Contact not found")
+    await response_cache.invalidate(contacts_cache(user.id))
+    return {"message": "Contact deleted"}
+
+@router.get("/contacts/search/", response_model=List[ContactSearchResponse], dependencies=[Depends(RateLimit("contacts.search"))])
+async def search_contacts(
+    response: Response,
+    query: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[Tuple[str, ...]] = Depends(contact_fields),
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Search the current user's contacts based on a query, best matches first."""
+    if CONTACT_FAST_JSON or fields:
+        rows = await contacts.search_contacts(db, user.id, query, limit, field_columns(fields))
+        return contacts_response(contact_dicts(rows, fields), response, sparse=bool(fields))
+    return await contacts.search_contacts(db, user.id, query, limit)
+
+@router.get("/contacts/birthday/", response_model=List[ContactSearchResponse], dependencies=[Depends(RateLimit("contacts.read"))])
+async def upcoming_birthdays(
+    response: Response,
+    days: int = Query(7, ge=0, le=366),
+    fields: Optional[Tuple[str, ...]] = Depends(contact_fields),
+    user: User = Depends(get_current_user_from_token),
+    db: AsyncSession = Depends(db.get_async_db),
+):
+    """Get the current user's contacts whose birthday falls within the next `days` days, soonest first."""
+    today = datetime.now().date()
+    cache_key = f"birthdays:{today.isoformat()}:{days}:{fields_key(fields)}"
+    cached = await response_cache.get(contacts_cache(user.id), cache_key)
+    if cached is not None:
+        return contacts_response(cached, response, sparse=bool(fields))
+    if CONTACT_FAST_JSON or fields:
+        rows = await contacts.upcoming_birthdays(db, user.id, today, days, field_columns(fields))
+        cached = contact_dicts(rows, fields)
+    else:
+        items = await contacts.upcoming_birthdays(db, user.id, today, days)
+        cached = [jsonable_encoder(ContactSearchResponse.model_validate(contact)) for contact in items]
+    await response_cache.set(contacts_cache(user.id), cache_key, cached)
+    return contacts_response(cached, response, sparse=bool(fields))
@@ -0,0 +1,87 @@
+"""
+Metrics Routes
+
+This module exposes runtime metrics of the application for monitoring.
+
+The endpoints are disabled (404) unless METRICS_TOKEN is configured, and then require
+the header "Authorization: Bearer <METRICS_TOKEN>".
+
+Functions:
+    require_metrics_token(credentials: HTTPAuthorizationCredentials) -> None:
+        Reject requests without the configured metrics token.
+
+    get_pool_metrics() -> dict:
+        Get connection pool statistics of both database engines.
+
+    get_mail_metrics() -> dict:
+        Get outgoing mail queue statistics.
+
+    get_query_metrics() -> dict:
+        Get timings, row counts and statement counts of the repository calls and requests.
+
+Endpoints:
+    /metrics/pool/:
+        GET: Get connection pool statistics (checked-out, overflow, wait time, timeouts).
+
+    /metrics/mail/:
+        GET: Get outgoing mail queue statistics (queued, sent, retried, dead letters).
+
+    /metrics/queries/:
+        GET: Get histograms of duration, returned rows and SQL statements per repository call,
+        and of SQL statements per request, by route.
+"""
+
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from ..conf.config import METRICS_TOKEN
+from ..database import db
+from ..services.mail import mail_queue
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def require_metrics_token(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)):
+    """
+    Reject requests without the configured metrics token.
+
+    Args:
+        credentials (HTTPAuthorizationCredentials): Bearer credentials of the request, if any.
+
+    Raises:
+        HTTPException: 404 if the metrics are disabled, 401 if the token is missing or wrong.
+    """
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/metrics/pool/")
+def get_pool_metrics():
+    """Get connection pool statistics of both database engines."""
+    return {
+        "sync": db.pool_metrics.snapshot(),
+        "async": db.async_pool_metrics.snapshot(),
+    }
+
+
+@router.get("/metrics/mail/")
+def get_mail_metrics():
+    """Get outgoing mail queue statistics."""
+    return mail_queue.snapshot()
+
+
+@router.get("/metrics/queries/")
+def get_query_metrics():
+    """Get timings, row counts and statement counts of the repository calls and requests."""
+    return db.query_metrics.snapshot()
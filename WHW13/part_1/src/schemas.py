@@ -1,104 +1,260 @@
-from pydantic import BaseModel
-from typing import Optional
-
-class ContactBase(BaseModel):
-    """
-    Contact Base Schema
-
-    Represents the base schema for a contact.
-
-    Attributes:
-        first_name (str): First name of the contact.
-        last_name (str): Last name of the contact.
-        email (str): Email address of the contact.
-        phone_number (str): Phone number of the contact.
-        birthday (str, optional): Birthday of the contact (in string format).
-        additional_data (str, optional): Additional data about the contact.
-    """
-    first_name: str
-    last_name: str
-    email: str
-    phone_number: str
-    birthday: Optional[str] = None
-    additional_data: Optional[str] = None
-
-class ContactCreate(ContactBase):
-    """
-    Contact Create Schema
-
-    Represents the schema for creating a new contact based on the ContactBase.
-
-    Inherits:
-        ContactBase (class): The base schema for a contact.
-    """
-    pass
-
-class ContactUpdate(ContactBase):
-    """
-    Contact Update Schema
-
-    Represents the schema for updating an existing contact based on the ContactBase.
-
-    Inherits:
-        ContactBase (class): The base schema for a contact.
-    """
-    pass
-
-class ContactResponse(ContactBase):
-    """
-    Contact Response Schema
-
-    Represents the schema for a contact response, including the contact's ID.
-
-    Inherits:
-        ContactBase (class): The base schema for a contact.
-    """
-    id: int
-
-class ContactListResponse(ContactBase):
-    """
-    Contact List Response Schema
-
-    Represents the schema for a contact in a list response, including the contact's ID.
-
-    Inherits:
-        ContactBase (class): The base schema for a contact.
-    """
-    id: int
-
-class ContactSearchResponse(ContactBase):
-    """
-    Contact Search Response Schema
-
-    Represents the schema for a contact in a search response, including the contact's ID.
-
-    Inherits:
-        ContactBase (class): The base schema for a contact.
-    """
-    id: int
-
-class UserCreate(BaseModel):
-    """
-    User Create Schema
-
-    Represents the schema for creating a new user.
-
-    Attributes:
-        email (str): Email address of the user.
-        password (str): Password of the user.
-    """
-    email: str
-    password: str
-
-class Token(BaseModel):
-    """
-    Token Schema
-
-    Represents the schema for an access token.
-
-    Attributes:
-        access_token (str): The access token.
-        token_type (str): The type of the token.
-    """
-    access_token: str
+from pydantic import BaseModel, ConfigDict, conlist, field_validator, model_validator
+from datetime import date
+from typing import List, Optional
+
+from .conf.config import CONTACT_BATCH_MAX_IDS
+
+class ContactBase(BaseModel):
+    """
+    Contact Base Schema
+
+    Represents the base schema for a contact.
+
+    Attributes:
+        first_name (str): First name of the contact.
+        last_name (str): Last name of the contact.
+        email (str): Email address of the contact.
+        phone_number (str): Phone number of the contact.
+        birthday (date, optional): Birthday of the contact (ISO format, YYYY-MM-DD).
+        additional_data (str, optional): Additional data about the contact.
+    """
+    first_name: str
+    last_name: str
+    email: str
+    phone_number: str
+    birthday: Optional[date] = None
+    additional_data: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ContactCreate(ContactBase):
+    """
+    Contact Create Schema
+
+    Represents the schema for creating a new contact based on the ContactBase.
+
+    Inherits:
+        ContactBase (class): The base schema for a contact.
+    """
+    pass
+
+class ContactUpdate(ContactBase):
+    """
+    Contact Update Schema
+
+    Represents the schema for updating an existing contact based on the ContactBase.
+
+    Inherits:
+        ContactBase (class): The base schema for a contact.
+    """
+    pass
+
+class ContactPatch(BaseModel):
+    """
+    Contact Patch Schema
+
+    Represents a partial update of a contact: only the fields present in the request are changed.
+
+    Attributes:
+        first_name (str, optional): New first name.
+        last_name (str, optional): New last name.
+        email (str, optional): New email address.
+        phone_number (str, optional): New phone number.
+        birthday (date, optional): New birthday; null clears it.
+        additional_data (str, optional): New additional data; null clears it.
+    """
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+    birthday: Optional[date] = None
+    additional_data: Optional[str] = None
+
+    @field_validator("first_name", "last_name", "email", "phone_number")
+    @classmethod
+    def required_not_null(cls, value):
+        """The required columns may be left out, but not set to null."""
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
+class ContactFilter(BaseModel):
+    """
+    Contact Filter Schema
+
+    Selects contacts by field values; all given conditions must match.
+
+    Attributes:
+        last_name (str, optional): Exact last name.
+        email_domain (str, optional): Domain of the email address, e.g. "example.com".
+        birthday_from (date, optional): Earliest birthday, inclusive.
+        birthday_to (date, optional): Latest birthday, inclusive.
+    """
+    last_name: Optional[str] = None
+    email_domain: Optional[str] = None
+    birthday_from: Optional[date] = None
+    birthday_to: Optional[date] = None
+
+class ContactSelection(BaseModel):
+    """
+    Contact Selection Schema
+
+    Selects the contacts a batch operation applies to, by ids and/or a filter. At least one must
+    be given, so a batch can never touch every contact by accident.
+
+    Attributes:
+        ids (List[int], optional): Ids of the contacts, at most `CONTACT_BATCH_MAX_IDS`.
+        filter (ContactFilter, optional): Conditions the contacts must match.
+    """
+    ids: Optional[conlist(int, min_length=1, max_length=CONTACT_BATCH_MAX_IDS)] = None
+    filter: Optional[ContactFilter] = None
+
+    @model_validator(mode="after")
+    def ids_or_filter(self):
+        """Require ids or a filter with at least one condition."""
+        if not self.ids and not (self.filter and self.filter.model_dump(exclude_none=True)):
+            raise ValueError("Either ids or a non-empty filter is required")
+        return self
+
+class ContactBatchUpdate(ContactSelection):
+    """
+    Contact Batch Update Schema
+
+    Represents a partial update applied to every selected contact.
+
+    Attributes:
+        changes (ContactPatch): Fields to set on the selected contacts.
+    """
+    changes: ContactPatch
+
+class ContactBatchDeleteResult(BaseModel):
+    """
+    Contact Batch Delete Result Schema
+
+    Represents the outcome of a batch delete.
+
+    Attributes:
+        deleted (int): Number of contacts deleted.
+        ids (List[int]): Ids of the deleted contacts.
+    """
+    deleted: int
+    ids: List[int]
+
+class ContactResponse(ContactBase):
+    """
+    Contact Response Schema
+
+    Represents the schema for a contact response, including the contact's ID.
+
+    Inherits:
+        ContactBase (class): The base schema for a contact.
+    """
+    id: int
+
+class ContactListResponse(ContactBase):
+    """
+    Contact List Response Schema
+
+    Represents the schema for a contact in a list response, including the contact's ID.
+
+    Inherits:
+        ContactBase (class): The base schema for a contact.
+    """
+    id: int
+
+class ContactSearchResponse(ContactBase):
+    """
+    Contact Search Response Schema
+
+    Represents the schema for a contact in a search response, including the contact's ID.
+
+    Inherits:
+        ContactBase (class): The base schema for a contact.
+    """
+    id: int
+
+class ContactPage(BaseModel):
+    """
+    Contact Page Schema
+
+    Represents one page of a keyset-paginated contact listing.
+
+    Attributes:
+        items (List[ContactResponse]): Contacts on this page.
+        next_cursor (str, optional): Opaque cursor of the next page, or None on the last page.
+    """
+    items: List[ContactResponse]
+    next_cursor: Optional[str] = None
+
+class ContactImportError(BaseModel):
+    """
+    Contact Import Error Schema
+
+    Represents a row rejected by the bulk contact import.
+
+    Attributes:
+        row (int): Line number of the rejected row in the uploaded file.
+        detail (str): Why the row was rejected.
+    """
+    row: int
+    detail: str
+
+class ContactImportResult(BaseModel):
+    """
+    Contact Import Result Schema
+
+    Represents the outcome of a bulk contact import.
+
+    Attributes:
+        inserted (int): Number of contacts created.
+        failed (int): Number of rejected rows.
+        errors (List[ContactImportError]): Rejected rows with the reason, in file order.
+    """
+    inserted: int
+    failed: int
+    errors: List[ContactImportError]
+
+class UserCreate(BaseModel):
+    """
+    User Create Schema
+
+    Represents the schema for creating a new user.
+
+    Attributes:
+        email (str): Email address of the user.
+        password (str): Password of the user.
+    """
+    email: str
+    password: str
+
+class UserResponse(BaseModel):
+    """
+    User Response Schema
+
+    Represents the public profile of a user.
+
+    Attributes:
+        id (int): Unique identifier of the user.
+        email (str): Email address of the user.
+        verified (bool): Whether the email address is confirmed.
+        avatar_url (Optional[str]): URL of the user's avatar.
+    """
+    id: int
+    email: str
+    verified: Optional[bool]
+    avatar_url: Optional[str]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class Token(BaseModel):
+    """
+    Token Schema
+
+    Represents the schema for an access token.
+
+    Attributes:
+        access_token (str): The access token.
+        token_type (str): The type of the token.
+    """
+    access_token: str
     token_type: str
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Authentication Cache Module
+
+This module caches verified access tokens together with the user they resolve to, so that
+authenticated requests skip both the JWT decode and the user lookup by email.
+
+An entry lives for at most `AUTH_CACHE_TTL` seconds and never past the token's own `exp`.
+Entries of a user are dropped as soon as their password hash or verification status is
+assigned, through SQLAlchemy attribute events on `User`. Code that changes a user with a Core
+`UPDATE` (which fires no attribute events) calls `user_cache.invalidate_user` itself.
+
+Classes:
+    UserCache: Bounded LRU cache of access token -> user with per-entry expiry.
+
+Attributes:
+    user_cache (UserCache): The cache used by the authentication dependencies.
+
+Note:
+    The cache lives in the memory of one worker, so invalidation reaches only that worker;
+    other workers pick the change up within `AUTH_CACHE_TTL` seconds. Within the worker it is
+    guarded by a lock, since background tasks in the threadpool invalidate it as well.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from ..conf.config import AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL
+from ..database.models import User
+
+
+class UserCache:
+    """Bounded LRU cache of access token -> user with per-entry expiry."""
+
+    def __init__(self, max_entries: int = AUTH_CACHE_MAX_ENTRIES, ttl: int = AUTH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._tokens_by_email: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[User]:
+        """Return the user of a previously verified token, or None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._discard(token)
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def set(self, token: str, user: User, token_expires_at: float) -> None:
+        """Remember a verified token until its `exp` or for `ttl` seconds, whichever comes first."""
+        with self._lock:
+            self._discard(token)
+            self._entries[token] = (min(time.time() + self.ttl, token_expires_at), user)
+            self._tokens_by_email.setdefault(user.email, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, email: str) -> None:
+        """Forget every cached token of a user."""
+        with self._lock:
+            for token in self._tokens_by_email.pop(email, set()):
+                self._entries.pop(token, None)
+
+    def _discard(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_email.get(entry[1].email)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_email[entry[1].email]
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User.hashed_password, "set")
+@event.listens_for(User.verified, "set")
+def _invalidate_on_credentials_change(target, value, oldvalue, initiator):
+    """Drop cached tokens when a user's password or verification status changes."""
+    if target.email:
+        user_cache.invalidate_user(target.email)
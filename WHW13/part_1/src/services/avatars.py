@@ -0,0 +1,268 @@
+"""
+Avatar Pipeline Module
+
+This module processes uploaded avatars outside the request that received them.
+
+The request only streams the upload into a spool file while hashing it (SHA-256) and checks that
+it is an image. Resizing to the fixed `AVATAR_SIZES`, recompressing to `AVATAR_FORMAT` and
+uploading to the storage backend happen afterwards in a background task. Renditions are stored
+under the content hash, so an image that is already stored (by this or any other user) is not
+processed or uploaded again.
+
+Classes:
+    AvatarStorage: Interface of the storage backends.
+    LocalAvatarStorage: Stores avatars in a local directory served as static files.
+    CloudinaryAvatarStorage: Stores avatars in Cloudinary.
+
+Functions:
+    spool_upload(upload: UploadFile, max_bytes: int) -> Tuple[str, str]:
+        Copy an upload into a spool file, returning its path and SHA-256 digest.
+
+    check_image(path: str) -> None:
+        Reject files that are not images or exceed `AVATAR_MAX_PIXELS`.
+
+    avatar_url(digest: str) -> str:
+        URL the avatar of an image with this digest will have once it is stored.
+
+    render_avatar(path: str) -> Dict[int, bytes]:
+        Resize and recompress an image to every size of `AVATAR_SIZES`.
+
+    store_avatar(user_id: int, path: str, digest: str) -> None:
+        Background task: store the renditions of a spooled upload, point the user at them and
+        drop the user's cached access tokens.
+
+Attributes:
+    storage (AvatarStorage): The backend selected by `AVATAR_STORAGE`.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple
+
+from cloudinary import CloudinaryImage
+from cloudinary.api import resource
+from cloudinary.exceptions import NotFound
+from cloudinary.uploader import upload
+from fastapi import HTTPException, UploadFile, status
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import update
+
+from ..conf.config import (
+    CLOUDINARY_API_KEY,
+    CLOUDINARY_API_SECRET,
+    CLOUDINARY_CLOUD_NAME,
+    AVATAR_STORAGE,
+    AVATAR_LOCAL_DIR,
+    AVATAR_LOCAL_URL,
+    AVATAR_SIZES,
+    AVATAR_FORMAT,
+    AVATAR_QUALITY,
+    AVATAR_MAX_BYTES,
+    AVATAR_MAX_PIXELS,
+)
+from ..database.db import SessionLocal
+from ..database.models import User
+from .auth_cache import user_cache
+
+CHUNK_SIZE = 64 * 1024
+
+
+class AvatarStorage(ABC):
+    """Interface of the storage backends; keys look like "<sha256>_<size>"."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Tell whether a rendition with this key is already stored."""
+
+    @abstractmethod
+    def save(self, key: str, data: bytes) -> None:
+        """Store an encoded rendition under `key`."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """Public URL of the rendition stored under `key`."""
+
+
+class LocalAvatarStorage(AvatarStorage):
+    """Stores avatars in a local directory served as static files under `base_url`."""
+
+    def __init__(self, root: str = AVATAR_LOCAL_DIR, base_url: str = AVATAR_LOCAL_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        self.extension = AVATAR_FORMAT.lower()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.{self.extension}")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def save(self, key: str, data: bytes) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        # Запис через тимчасовий файл, щоб ніхто не побачив напівзаписане зображення
+        fd, tmp_path = tempfile.mkstemp(dir=self.root)
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, self._path(key))
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{key}.{self.extension}"
+
+
+class CloudinaryAvatarStorage(AvatarStorage):
+    """Stores avatars in Cloudinary under `folder`, with the key as the public id."""
+
+    def __init__(self, folder: str = "avatars"):
+        self.folder = folder
+        self.extension = AVATAR_FORMAT.lower()
+        self.credentials = {
+            "api_key": CLOUDINARY_API_KEY,
+            "api_secret": CLOUDINARY_API_SECRET,
+            "cloud_name": CLOUDINARY_CLOUD_NAME,
+        }
+
+    def _public_id(self, key: str) -> str:
+        return f"{self.folder}/{key}"
+
+    def exists(self, key: str) -> bool:
+        try:
+            resource(self._public_id(key), **self.credentials)
+            return True
+        except NotFound:
+            return False
+
+    def save(self, key: str, data: bytes) -> None:
+        upload(
+            data,
+            public_id=self._public_id(key),
+            overwrite=False,
+            resource_type="image",
+            **self.credentials,
+        )
+
+    def url(self, key: str) -> str:
+        return CloudinaryImage(self._public_id(key)).build_url(
+            format=self.extension, secure=True, cloud_name=CLOUDINARY_CLOUD_NAME
+        )
+
+
+def get_storage() -> AvatarStorage:
+    """Create the backend selected by `AVATAR_STORAGE`."""
+    if AVATAR_STORAGE == "local":
+        return LocalAvatarStorage()
+    return CloudinaryAvatarStorage()
+
+
+storage = get_storage()
+
+
+def avatar_key(digest: str, size: int) -> str:
+    return f"{digest}_{size}"
+
+
+def avatar_url(digest: str) -> str:
+    """URL the avatar of an image with this digest will have once it is stored."""
+    return storage.url(avatar_key(digest, AVATAR_SIZES[0]))
+
+
+async def spool_upload(upload_file: UploadFile, max_bytes: int = AVATAR_MAX_BYTES) -> Tuple[str, str]:
+    """
+    Copy an upload into a spool file chunk by chunk, hashing it on the way.
+
+    Returns:
+        Tuple[str, str]: Path of the spool file (owned by the caller) and the SHA-256 hex digest.
+
+    Raises:
+        HTTPException: 413 if the upload is larger than `max_bytes`.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="avatar-")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while chunk := await upload_file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Avatar must not exceed {max_bytes} bytes",
+                    )
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest()
+
+
+def check_image(path: str) -> None:
+    """
+    Reject files that are not images or exceed `AVATAR_MAX_PIXELS`.
+
+    Only the image header is read, so this is cheap enough to run within the request.
+
+    Raises:
+        HTTPException: 415 for files Pillow cannot identify, 413 for too large resolutions.
+    """
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Avatar must be an image")
+    if width * height > AVATAR_MAX_PIXELS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Avatar must not exceed {AVATAR_MAX_PIXELS} pixels",
+        )
+
+
+def render_avatar(path: str) -> Dict[int, bytes]:
+    """Resize and recompress an image to every size of `AVATAR_SIZES`, keyed by size."""
+    renditions = {}
+    with Image.open(path) as image:
+        # draft() дозволяє JPEG-декодеру одразу зменшити зображення замість повного декодування
+        image.draft("RGB", (max(AVATAR_SIZES),) * 2)
+        image = ImageOps.exif_transpose(image)
+        keep_alpha = "A" in image.getbands() and AVATAR_FORMAT.upper() != "JPEG"
+        image = image.convert("RGBA" if keep_alpha else "RGB")
+        for size in sorted(AVATAR_SIZES, reverse=True):
+            # Кожен менший розмір рахуємо з попереднього — так швидше, ніж щоразу з оригіналу
+            image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format=AVATAR_FORMAT, quality=AVATAR_QUALITY)
+            renditions[size] = buffer.getvalue()
+    return renditions
+
+
+def store_avatar(user_id: int, path: str, digest: str) -> None:
+    """
+    Background task: store the renditions of a spooled upload and point the user at them.
+
+    If the image is already stored it is neither rendered nor uploaded again. That is decided by a
+    single `exists` call, because the Cloudinary Admin API behind it is rate limited per hour. The
+    spool file is removed in any case. The user's entries in `auth_cache.user_cache` are dropped, so
+    the next request loads the new `avatar_url`.
+    """
+    try:
+        # Рендиції пишуться в порядку AVATAR_SIZES, тож наявність останньої означає, що є всі.
+        # Після збою посередині наступне завантаження пише їх знову; Cloudinary з overwrite=False
+        # уже наявні не перезаписує
+        if not storage.exists(avatar_key(digest, AVATAR_SIZES[-1])):
+            renditions = render_avatar(path)
+            for size in AVATAR_SIZES:
+                storage.save(avatar_key(digest, size), renditions[size])
+    finally:
+        os.remove(path)
+
+    with SessionLocal() as db:
+        email = db.execute(
+            update(User).where(User.id == user_id).values(avatar_url=avatar_url(digest)).returning(User.email)
+        ).scalar_one_or_none()
+        db.commit()
+    # Core UPDATE не викликає подій атрибутів, тож кешовані токени скидаємо самі,
+    # інакше /users/me/ віддавав би старий аватар до кінця життя токена
+    if email is not None:
+        user_cache.invalidate_user(email)
@@ -0,0 +1,123 @@
+"""
+Response Cache Module
+
+This module caches JSON-ready responses of contact reads and invalidates them on writes.
+
+Entries are grouped in namespaces. Reads look a key up inside a namespace; any write to the data
+behind a namespace drops the whole namespace, so no individual keys need to be tracked.
+
+With `REDIS_URL` configured, each namespace is a Redis hash holding the entries with their expiry
+time, so a lookup is one HGET and an invalidation is one DEL, visible to all workers. Without
+Redis (development, tests) an in-process LRU cache with TTL is used instead.
+
+Classes:
+    MemoryCache: In-process LRU cache with per-entry TTL.
+    RedisCache: Cache stored in Redis hashes, one hash per namespace.
+
+Attributes:
+    response_cache (Union[MemoryCache, RedisCache]): The cache used by the routes.
+
+Note:
+    Cache failures never fail a request: a Redis error is treated as a cache miss.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..conf.config import CACHE_MAX_ENTRIES, CACHE_TTL
+from .redis import get_redis
+
+
+class MemoryCache:
+    """In-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: int = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, int, str], Tuple[float, Any]]" = OrderedDict()
+        # Інвалідація збільшує покоління простору імен; старі записи витісняє LRU
+        self._generations: Dict[str, int] = {}
+
+    def _key(self, namespace: str, key: str) -> Tuple[str, int, str]:
+        return namespace, self._generations.get(namespace, 0), key
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        cache_key = self._key(namespace, key)
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[cache_key]
+            return None
+        self._entries.move_to_end(cache_key)
+        return value
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value for `ttl` seconds, evicting the least recently used entries when full."""
+        cache_key = self._key(namespace, key)
+        self._entries[cache_key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, namespace: str) -> None:
+        """Drop every entry of a namespace."""
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisCache:
+    """Cache stored in Redis hashes, one hash per namespace."""
+
+    def __init__(self, redis: Redis, ttl: int = CACHE_TTL, prefix: str = "cache"):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _name(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it is missing, expired or Redis is unavailable."""
+        try:
+            raw = await self.redis.hget(self._name(namespace), key)
+        except RedisError:
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return entry["v"] if entry["e"] >= time.time() else None
+
+    async def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a value for `ttl` seconds; the namespace hash expires with its newest entry."""
+        ttl = ttl or self.ttl
+        name = self._name(namespace)
+        payload = json.dumps({"e": time.time() + ttl, "v": value}, default=str)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(name, key, payload)
+                pipe.expire(name, ttl)
+                await pipe.execute()
+        except RedisError:
+            pass
+
+    async def invalidate(self, namespace: str) -> None:
+        """Drop every entry of a namespace."""
+        try:
+            await self.redis.delete(self._name(namespace))
+        except RedisError:
+            pass
+
+
+def _build_cache():
+    redis = get_redis()
+    return RedisCache(redis) if redis is not None else MemoryCache()
+
+
+response_cache = _build_cache()
@@ -0,0 +1,145 @@
+"""
+Conditional Requests Module
+
+This module implements HTTP validators for contact resources: strong ETags, `Last-Modified`,
+`If-None-Match` / `If-Modified-Since` for conditional GETs and `If-Match` for optimistic
+concurrency on updates.
+
+A contact's ETag is its id and `version`, which every write increments, so it is known without
+serializing the contact. The ETag of a listing is a hash over the (id, version) pairs it contains,
+so it changes whenever a contact is added, removed or modified. Listings carry no `Last-Modified`:
+removing a contact does not raise the newest `updated_at` of a page, so `If-Modified-Since` would
+keep a deleted contact alive in the client's copy. Sparse fieldsets are different representations
+and get a `variant` suffix, e.g. "12-3.1a2b3c4d".
+
+Functions:
+    contact_etag(contact: Contact, variant: str = "") -> str:
+        Strong ETag of a single contact.
+
+    collection_etag(contacts: Iterable[Contact], variant: str = "") -> str:
+        Strong ETag of a list of contacts.
+
+    http_date(moment: Optional[datetime]) -> Optional[str]:
+        Format a timestamp for `Last-Modified`.
+
+    validator_headers(etag: str, last_modified: Optional[str]) -> Dict[str, str]:
+        Response headers carrying the validators of a representation.
+
+    not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+        Tell whether a conditional GET can be answered with 304 Not Modified.
+
+    not_modified_response(headers: Dict[str, str], response: Response) -> Response:
+        304 Not Modified with the validators and the headers already set on `response`.
+
+    expected_version(request: Request, contact_id: int) -> Optional[int]:
+        Version of the contact an `If-Match` request was made against.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from ..database.models import Contact
+
+# Клієнт має щоразу перевіряти актуальність, але може повторно використати тіло після 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def contact_etag(contact: Contact, variant: str = "") -> str:
+    """Strong ETag of a single contact, e.g. "12-3" for version 3 of contact 12."""
+    return f'"{contact.id}-{contact.version}{variant}"'
+
+
+def collection_etag(contacts: Iterable[Contact], variant: str = "") -> str:
+    """Strong ETag of a list of contacts, derived from their ids and versions in order."""
+    digest = hashlib.sha1()
+    for contact in contacts:
+        digest.update(f"{contact.id}-{contact.version};".encode())
+    return f'"{digest.hexdigest()}{variant}"'
+
+
+def http_date(moment: Optional[datetime]) -> Optional[str]:
+    """Format a timestamp as an HTTP date; naive timestamps are taken to be UTC."""
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: Optional[str]) -> Dict[str, str]:
+    """Response headers carrying the validators of a representation."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def _entity_tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    """
+    Tell whether a conditional GET can be answered with 304 Not Modified.
+
+    `If-None-Match` uses the weak comparison and, when present, takes precedence over
+    `If-Modified-Since` (RFC 9110, section 13.2.2).
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = _entity_tags(if_none_match)
+        return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(headers: Dict[str, str], response: Response) -> Response:
+    """
+    304 Not Modified with the validators in `headers`.
+
+    Headers already set on `response` by the dependencies (rate limit) are carried over, as
+    `serialization.contacts_response` does for the fast path.
+    """
+    reply = Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    reply.raw_headers.extend(response.raw_headers)
+    return reply
+
+
+def expected_version(request: Request, contact_id: int) -> Optional[int]:
+    """
+    Version of the contact an `If-Match` request was made against.
+
+    Returns:
+        Optional[int]: None if there is no `If-Match` header or it is "*" (any existing contact).
+
+    Raises:
+        HTTPException: 412 if none of the listed ETags can belong to this contact.
+    """
+    if_match = request.headers.get("If-Match")
+    if if_match is None:
+        return None
+    tags = _entity_tags(if_match)
+    if "*" in tags:
+        return None
+    # If-Match вимагає сильного порівняння, тож слабкі ETag ніколи не збігаються
+    prefix = f'"{contact_id}-'
+    for tag in tags:
+        if tag.startswith(prefix) and tag.endswith('"'):
+            # ETag часткового подання має суфікс ".<fieldset>", але версія та сама
+            version = tag[len(prefix):-1].partition(".")[0]
+            if version.isdigit():
+                return int(version)
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="Contact has been modified")
@@ -0,0 +1,301 @@
+"""
+Outgoing Mail Module
+
+This module delivers outgoing mail in the background, so request handlers only enqueue a message
+and never wait for the SMTP server.
+
+`MAIL_WORKERS` worker tasks take messages off a bounded `asyncio.Queue` in batches of up to
+`MAIL_BATCH_SIZE`. Each worker sends over its own SMTP connection, which is kept open between
+batches and closed after `MAIL_IDLE_TIMEOUT` seconds without mail. A message that fails for a transient
+reason (connection lost, 4xx reply) is retried with exponential backoff; a message the server
+rejects permanently (5xx reply) or that runs out of `MAIL_MAX_ATTEMPTS` goes to a bounded
+dead-letter list, which is exposed by the metrics route without the recipients' addresses
+(they stay in the server log).
+
+Classes:
+    OutgoingMail: A queued message together with its delivery attempts.
+    SMTPConnection: An SMTP connection opened on first use and reused until dropped.
+    MailQueue: Background queue delivering mail over persistent SMTP connections.
+
+Attributes:
+    mail_queue (MailQueue): The queue used by the application, started and stopped with it.
+
+Note:
+    The queue lives in the memory of one worker: messages still queued when the process is
+    killed are lost. `MailQueue.stop` flushes the queue on a graceful shutdown.
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Deque, Dict, List, Optional, Tuple
+
+from aiosmtplib import (
+    SMTP,
+    SMTPAuthenticationError,
+    SMTPException,
+    SMTPRecipientsRefused,
+    SMTPResponseException,
+    SMTPServerDisconnected,
+)
+
+from ..conf.config import (
+    MAIL_SERVER,
+    MAIL_PORT,
+    MAIL_USERNAME,
+    MAIL_PASSWORD,
+    MAIL_FROM,
+    MAIL_STARTTLS,
+    MAIL_SSL_TLS,
+    MAIL_TIMEOUT,
+    MAIL_QUEUE_SIZE,
+    MAIL_BATCH_SIZE,
+    MAIL_IDLE_TIMEOUT,
+    MAIL_MAX_ATTEMPTS,
+    MAIL_RETRY_BACKOFF,
+    MAIL_RETRY_BACKOFF_MAX,
+    MAIL_DEAD_LETTER_SIZE,
+    MAIL_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingMail:
+    """A queued message together with its delivery attempts."""
+
+    recipient: str
+    subject: str
+    body: str
+    attempts: int = 0
+    error: Optional[str] = None
+
+    def to_message(self) -> EmailMessage:
+        """Build the MIME message sent over SMTP."""
+        message = EmailMessage()
+        message["From"] = MAIL_FROM
+        message["To"] = self.recipient
+        message["Subject"] = self.subject
+        message.set_content(self.body)
+        return message
+
+
+def is_permanent(error: Exception) -> bool:
+    """Tell whether retrying a message rejected with `error` is pointless."""
+    if isinstance(error, SMTPRecipientsRefused):
+        return True
+    # Помилка входу — проблема налаштувань, а не листа: повторюємо, поки не виправлять
+    return (
+        isinstance(error, SMTPResponseException)
+        and not isinstance(error, SMTPAuthenticationError)
+        and error.code >= 500
+    )
+
+
+class SMTPConnection:
+    """An SMTP connection opened on first use and reused until it is closed or dropped."""
+
+    def __init__(self):
+        self._smtp: Optional[SMTP] = None
+
+    async def get(self) -> Tuple[SMTP, bool]:
+        """Return the open connection, connecting first if needed, and whether it is new."""
+        if self._smtp is not None and self._smtp.is_connected:
+            return self._smtp, False
+        smtp = SMTP(
+            hostname=MAIL_SERVER,
+            port=MAIL_PORT,
+            username=MAIL_USERNAME or None,
+            password=MAIL_PASSWORD or None,
+            use_tls=MAIL_SSL_TLS,
+            start_tls=MAIL_STARTTLS and not MAIL_SSL_TLS,
+            timeout=MAIL_TIMEOUT,
+        )
+        await smtp.connect()
+        self._smtp = smtp
+        return smtp, True
+
+    async def close(self) -> None:
+        """Say QUIT and close the connection, if it is open."""
+        smtp, self._smtp = self._smtp, None
+        if smtp is None or not smtp.is_connected:
+            return
+        try:
+            await smtp.quit()
+        except (SMTPException, OSError):
+            smtp.close()
+
+
+class MailQueue:
+    """Background queue delivering mail over persistent SMTP connections."""
+
+    def __init__(
+        self,
+        maxsize: int = MAIL_QUEUE_SIZE,
+        batch_size: int = MAIL_BATCH_SIZE,
+        max_attempts: int = MAIL_MAX_ATTEMPTS,
+        dead_letter_size: int = MAIL_DEAD_LETTER_SIZE,
+        workers: int = MAIL_WORKERS,
+    ):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.dead_letters: Deque[OutgoingMail] = deque(maxlen=dead_letter_size)
+        self._maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._delayed: Dict[asyncio.TimerHandle, OutgoingMail] = {}
+        self._workers: List[Tuple[asyncio.Task, SMTPConnection]] = []
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Черга створюється ліниво, щоб належати циклу подій застосунку
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._maxsize)
+        return self._queue
+
+    def enqueue(self, recipient: str, subject: str, body: str) -> bool:
+        """
+        Queue a plain-text message for delivery and return immediately.
+
+        Returns:
+            bool: False if the queue is full; the message then goes straight to the dead letters.
+        """
+        return self._put(OutgoingMail(recipient=recipient, subject=subject, body=body))
+
+    def _put(self, mail: OutgoingMail) -> bool:
+        try:
+            self.queue.put_nowait(mail)
+            return True
+        except asyncio.QueueFull:
+            self._dead_letter(mail, "Mail queue is full")
+            return False
+
+    def _dead_letter(self, mail: OutgoingMail, error: str) -> None:
+        mail.error = error
+        self.failed += 1
+        self.dead_letters.append(mail)
+        logger.warning("Giving up on mail to %s after %d attempt(s): %s", mail.recipient, mail.attempts, error)
+
+    def _retry(self, mail: OutgoingMail, error: Exception) -> None:
+        if mail.attempts >= self.max_attempts or is_permanent(error):
+            self._dead_letter(mail, str(error))
+            return
+        mail.error = str(error)
+        self.retried += 1
+        # Експоненційна затримка з джитером, щоб повтори не приходили одночасно
+        delay = min(MAIL_RETRY_BACKOFF_MAX, MAIL_RETRY_BACKOFF * 2 ** (mail.attempts - 1))
+        delay *= random.uniform(0.5, 1.0)
+
+        def requeue():
+            del self._delayed[handle]
+            self._put(mail)
+
+        handle = asyncio.get_running_loop().call_later(delay, requeue)
+        self._delayed[handle] = mail
+
+    async def _send(self, mail: OutgoingMail, connection: SMTPConnection) -> None:
+        mail.attempts += 1
+        message = mail.to_message()
+        smtp, fresh = await connection.get()
+        try:
+            await smtp.send_message(message)
+        except SMTPServerDisconnected:
+            if fresh:
+                raise
+            # Сервер закрив простоюче з'єднання — одна спроба з новим не рахується як повтор
+            await connection.close()
+            smtp, _ = await connection.get()
+            await smtp.send_message(message)
+
+    async def _send_batch(self, batch: List[OutgoingMail], connection: SMTPConnection) -> None:
+        for index, mail in enumerate(batch):
+            try:
+                await self._send(mail, connection)
+                self.sent += 1
+            except (SMTPResponseException, SMTPRecipientsRefused) as error:
+                # Сервер відхилив лише цей лист, з'єднання лишається придатним
+                self._retry(mail, error)
+            except (SMTPException, OSError, asyncio.TimeoutError) as error:
+                # З'єднання недоступне: решту пачки відкладаємо разом із цим листом
+                await connection.close()
+                for pending in batch[index:]:
+                    self._retry(pending, error)
+                return
+            except Exception as error:
+                logger.exception("Unexpected error while sending mail to %s", mail.recipient)
+                self._dead_letter(mail, str(error))
+
+    async def _run(self, connection: SMTPConnection) -> None:
+        queue = self.queue
+        while True:
+            try:
+                mail = await asyncio.wait_for(queue.get(), MAIL_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                await connection.close()
+                continue
+            batch = [mail]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._send_batch(batch, connection)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def start(self) -> None:
+        """Start the delivery workers on the running event loop."""
+        if self._workers:
+            return
+        for _ in range(self.workers):
+            connection = SMTPConnection()
+            self._workers.append((asyncio.create_task(self._run(connection)), connection))
+
+    async def stop(self, timeout: float = MAIL_TIMEOUT) -> None:
+        """Flush the queue for up to `timeout` seconds, then stop the workers and close their connections."""
+        if self._workers:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        for task, _ in self._workers:
+            task.cancel()
+        await asyncio.gather(*(task for task, _ in self._workers), return_exceptions=True)
+        for _, connection in self._workers:
+            await connection.close()
+        self._workers.clear()
+        for handle, mail in list(self._delayed.items()):
+            handle.cancel()
+            self._dead_letter(mail, f"Not delivered before shutdown: {mail.error}")
+        self._delayed.clear()
+        while self._queue is not None and not self._queue.empty():
+            self._dead_letter(self._queue.get_nowait(), "Not delivered before shutdown")
+
+    def snapshot(self) -> dict:
+        """Return the queue depth, delivery counters and the most recent dead letters, without recipients."""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "delayed": len(self._delayed),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            # Ні тіла листа (коди підтвердження), ні адреси отримувача (персональні дані) не віддаємо;
+            # адресу прибираємо й з тексту помилки, куди її часто вставляє SMTP-сервер
+            "dead_letters": [
+                {
+                    "subject": mail.subject,
+                    "attempts": mail.attempts,
+                    "error": mail.error.replace(mail.recipient, "<recipient>") if mail.error else mail.error,
+                }
+                for mail in self.dead_letters
+            ],
+        }
+
+
+mail_queue = MailQueue()
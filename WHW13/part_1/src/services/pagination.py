@@ -0,0 +1,74 @@
+"""
+Keyset Pagination Module
+
+This module provides opaque cursors for keyset (seek) pagination of the contacts listing.
+
+Instead of `OFFSET n`, which makes the database walk and discard `n` rows, every page is fetched
+with `WHERE (sort key) > (last key of the previous page)`, which an index answers directly.
+Deep pages therefore cost the same as the first one.
+
+Attributes:
+    CONTACT_ORDERINGS (dict): Supported orderings mapped to the contact columns forming the key.
+
+Functions:
+    encode_cursor(order_by: str, key: tuple) -> str:
+        Build an opaque cursor from the sort key of the last row on a page.
+
+    decode_cursor(cursor: str, order_by: str) -> tuple:
+        Restore the sort key from a cursor produced by `encode_cursor`.
+
+    paginate_contacts(stmt: Select, order_by: str, limit: int, cursor: Optional[str]) -> Select:
+        Apply keyset ordering, filtering and limiting to a contacts query.
+"""
+
+import base64
+import binascii
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+
+from ..database.models import Contact
+
+CONTACT_ORDERINGS = {
+    "id": (Contact.id,),
+    "last_name": (Contact.last_name, Contact.id),
+}
+
+
+def encode_cursor(order_by: str, key: tuple) -> str:
+    """Build an opaque cursor from the sort key of the last row on a page."""
+    payload = json.dumps({"o": order_by, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> tuple:
+    """
+    Restore the sort key from a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for a different ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        key = tuple(payload["k"])
+        valid = payload["o"] == order_by and len(key) == len(CONTACT_ORDERINGS[order_by])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key
+
+
+def paginate_contacts(stmt: Select, order_by: str, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Apply keyset ordering, filtering and limiting to a contacts query.
+
+    One row more than `limit` is requested so the caller can tell whether a next page exists.
+    """
+    columns = CONTACT_ORDERINGS[order_by]
+    if cursor:
+        stmt = stmt.where(tuple_(*columns) > tuple_(*decode_cursor(cursor, order_by)))
+    return stmt.order_by(*columns).limit(limit + 1)
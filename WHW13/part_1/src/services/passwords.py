@@ -0,0 +1,114 @@
+"""
+Password Hashing Module
+
+This module is the single place where passwords are hashed and verified.
+
+Hashing uses a passlib `CryptContext` configured from `src.conf.config`: the first scheme of
+`PASSWORD_SCHEMES` (argon2 by default) hashes new passwords, and hashes made with another scheme
+or with outdated cost parameters are reported for rehashing when they are verified. Hashes made
+earlier with werkzeug's `generate_password_hash` are still accepted and are always rehashed.
+
+Hashing is CPU-bound, so the async functions run it in a dedicated, bounded thread or process
+pool (`PASSWORD_HASH_EXECUTOR`, `PASSWORD_HASH_WORKERS`) instead of the event loop or the
+request threadpool.
+
+Functions:
+    hash_password_sync(password: str) -> str:
+        Hash a password in the calling thread.
+
+    verify_password_sync(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+        Verify a password in the calling thread; also return a new hash if it needs upgrading.
+
+    hash_password(password: str) -> str:
+        Hash a password in the password pool.
+
+    verify_password(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+        Verify a password in the password pool; also return a new hash if it needs upgrading.
+
+    shutdown() -> None:
+        Stop the password pool.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+from werkzeug.security import check_password_hash
+
+from ..conf.config import (
+    PASSWORD_SCHEMES,
+    PASSWORD_ARGON2_TIME_COST,
+    PASSWORD_ARGON2_MEMORY_COST,
+    PASSWORD_ARGON2_PARALLELISM,
+    PASSWORD_BCRYPT_ROUNDS,
+    PASSWORD_HASH_EXECUTOR,
+    PASSWORD_HASH_WORKERS,
+)
+
+pwd_context = CryptContext(
+    schemes=PASSWORD_SCHEMES,
+    deprecated="auto",
+    argon2__rounds=PASSWORD_ARGON2_TIME_COST,
+    argon2__memory_cost=PASSWORD_ARGON2_MEMORY_COST,
+    argon2__parallelism=PASSWORD_ARGON2_PARALLELISM,
+    bcrypt__rounds=PASSWORD_BCRYPT_ROUNDS,
+)
+
+# Префікси хешів werkzeug.generate_password_hash, якими користувалися раніше
+WERKZEUG_PREFIXES = ("pbkdf2:", "scrypt:")
+
+_executor: Optional[Executor] = None
+
+
+def hash_password_sync(password: str) -> str:
+    """Hash a password in the calling thread."""
+    return pwd_context.hash(password)
+
+
+def verify_password_sync(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password in the calling thread.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matches, and a new hash to store when the
+        old one uses a deprecated scheme or cost. Without a stored hash a dummy verification still
+        runs, so unknown users take as long to reject as wrong passwords.
+    """
+    if not hashed:
+        pwd_context.dummy_verify()
+        return False, None
+    if hashed.startswith(WERKZEUG_PREFIXES):
+        if not check_password_hash(hashed, password):
+            return False, None
+        return True, pwd_context.hash(password)
+    return pwd_context.verify_and_update(password, hashed)
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if PASSWORD_HASH_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        else:
+            # argon2-cffi і bcrypt звільняють GIL, тож потоки хешують паралельно
+            _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    return _executor
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password in the password pool."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), hash_password_sync, password)
+
+
+async def verify_password(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Verify a password in the password pool; also return a new hash if it needs upgrading."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), verify_password_sync, password, hashed)
+
+
+def shutdown() -> None:
+    """Stop the password pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,253 @@
+"""
+Rate Limiting Module
+
+This module limits how often a client may call a route, with one token bucket per route budget
+and client.
+
+A budget such as "10/minute" is a bucket holding up to 10 tokens that refills at 10 tokens per
+minute, so short bursts are allowed while the long-run rate stays bounded. Budgets are named per
+route group and configured through `RATE_LIMITS`; routes without an entry use
+`RATE_LIMIT_DEFAULT`.
+
+Clients are identified by the subject of a valid bearer token, so a user keeps one budget across
+addresses, and otherwise by their address. Behind `RATE_LIMIT_PROXY_HOPS` reverse proxies the
+address is taken from `X-Forwarded-For`, skipping the entries the proxies appended. The default
+of 0 ignores the header, since without a proxy the client writes it and could pick a fresh bucket
+per request; deployments behind a proxy must set `RATE_LIMIT_PROXY_HOPS`.
+
+With `REDIS_URL` configured the buckets live in Redis and are shared by all workers: a check is a
+single EVALSHA of an atomic Lua script, i.e. one round trip. Without Redis, or while Redis is
+unavailable, an in-process bucket store is used instead.
+
+Classes:
+    Budget: Capacity and refill period of a token bucket.
+    Decision: Outcome of taking a token, with the values of the RateLimit-* headers.
+    MemoryRateLimiter: Token buckets kept in process memory, bounded LRU.
+    RedisRateLimiter: Token buckets kept in Redis, updated by a Lua script.
+    RateLimit: FastAPI dependency enforcing a named budget on a route.
+
+Functions:
+    parse_budget(value: str) -> Budget:
+        Parse a budget such as "10/minute".
+
+    client_address(request: Request) -> str:
+        Address of the client, taken from `X-Forwarded-For` when behind trusted proxies.
+
+    client_identity(request: Request) -> str:
+        Identify the client a request is counted against.
+
+Attributes:
+    rate_limiter (Union[MemoryRateLimiter, RedisRateLimiter]): The limiter used by the routes.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+from jose import JWTError, jwt
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..conf.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_DEFAULT,
+    RATE_LIMITS,
+    RATE_LIMIT_PROXY_HOPS,
+    RATE_LIMIT_MAX_KEYS,
+)
+from ..routes.auth import ALGORITHM, SECRET_KEY
+from .auth_cache import user_cache
+from .redis import get_redis
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Атомарний token bucket: читання, поповнення і списання в одному виклику.
+# Час береться з Redis (TIME), тож годинники воркерів не мають значення.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = math.ceil((cost - tokens) / rate)
+end
+local reset = math.ceil((capacity - tokens) / rate)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.max(reset, 1))
+return {allowed, math.floor(tokens), retry_after, reset}
+"""
+
+
+class Budget(NamedTuple):
+    """Capacity and refill period (in seconds) of a token bucket."""
+
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+
+class Decision(NamedTuple):
+    """Outcome of taking a token, with the values of the RateLimit-* headers."""
+
+    allowed: bool
+    budget: Budget
+    remaining: int
+    reset: float
+    retry_after: float
+
+    def headers(self) -> Dict[str, str]:
+        """RateLimit-* response headers (IETF draft "RateLimit header fields for HTTP")."""
+        headers = {
+            "RateLimit-Limit": str(self.budget.capacity),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset)),
+            "RateLimit-Policy": f"{self.budget.capacity};w={math.ceil(self.budget.period)}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+def parse_budget(value: str) -> Budget:
+    """Parse a budget such as "10/minute" into a `Budget`."""
+    count, _, period = value.strip().partition("/")
+    if not count.strip().isdigit() or period.strip() not in PERIODS:
+        raise ValueError(f"Invalid rate limit '{value}', expected e.g. '10/minute'")
+    return Budget(int(count), PERIODS[period.strip()])
+
+
+def _parse_budgets(entries) -> Dict[str, Budget]:
+    budgets = {}
+    for entry in entries:
+        name, _, value = entry.partition("=")
+        budgets[name.strip()] = parse_budget(value)
+    return budgets
+
+
+DEFAULT_BUDGET = parse_budget(RATE_LIMIT_DEFAULT)
+BUDGETS = _parse_budgets(RATE_LIMITS)
+
+
+class MemoryRateLimiter:
+    """Token buckets kept in process memory, bounded LRU."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, key: str, budget: Budget, cost: int = 1) -> Decision:
+        """Take `cost` tokens from the bucket of `key` if it holds enough."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (budget.capacity, now))
+        tokens = min(budget.capacity, tokens + (now - updated) * budget.rate)
+        allowed = tokens >= cost
+        retry_after = 0.0
+        if allowed:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / budget.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        # Найдавніші відра вже майже напевно повні, тож їх можна просто забути
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        reset = (budget.capacity - tokens) / budget.rate
+        return Decision(allowed, budget, int(tokens), reset, retry_after)
+
+
+class RedisRateLimiter:
+    """Token buckets kept in Redis, updated atomically by a Lua script."""
+
+    def __init__(self, redis: Redis, prefix: str = "ratelimit"):
+        self.prefix = prefix
+        # register_script виконує EVALSHA і сам довантажує скрипт після NOSCRIPT
+        self._script = redis.register_script(TOKEN_BUCKET_LUA)
+        self._fallback = MemoryRateLimiter()
+
+    async def hit(self, key: str, budget: Budget, cost: int = 1) -> Decision:
+        """Take `cost` tokens from the shared bucket of `key`; use process memory if Redis fails."""
+        try:
+            allowed, remaining, retry_after, reset = await self._script(
+                keys=[f"{self.prefix}:{key}"],
+                args=[budget.capacity, budget.rate / 1000, cost],
+            )
+        except RedisError:
+            return await self._fallback.hit(key, budget, cost)
+        return Decision(bool(allowed), budget, int(remaining), reset / 1000, retry_after / 1000)
+
+
+def _build_limiter():
+    redis = get_redis()
+    return RedisRateLimiter(redis) if redis is not None else MemoryRateLimiter()
+
+
+rate_limiter = _build_limiter()
+
+
+def client_address(request: Request) -> str:
+    """Address of the client, taken from `X-Forwarded-For` when behind trusted proxies."""
+    if RATE_LIMIT_PROXY_HOPS:
+        forwarded = [part.strip() for part in request.headers.get("X-Forwarded-For", "").split(",") if part.strip()]
+        if forwarded:
+            # Праві записи дописали наші проксі; лівіше від них клієнт міг написати що завгодно
+            return forwarded[max(0, len(forwarded) - RATE_LIMIT_PROXY_HOPS)]
+    return request.client.host if request.client else "unknown"
+
+
+def client_identity(request: Request) -> str:
+    """Identify the client a request is counted against: the token subject, else the address."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        user = user_cache.get(token)
+        if user is not None:
+            return f"user:{user.email}"
+        try:
+            subject = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return f"ip:{client_address(request)}"
+
+
+class RateLimit:
+    """
+    FastAPI dependency enforcing the budget `name` on a route.
+
+    Allowed requests get RateLimit-* headers; rejected ones fail with 429 and Retry-After.
+
+    Example:
+        >>> @router.get("/contacts/", dependencies=[Depends(RateLimit("contacts.read"))])
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.budget = BUDGETS.get(name, DEFAULT_BUDGET)
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        decision = await rate_limiter.hit(f"{self.name}:{client_identity(request)}", self.budget)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers=decision.headers(),
+            )
+        response.headers.update(decision.headers())
@@ -0,0 +1,38 @@
+"""
+Redis Connection Module
+
+This module owns the single Redis client of the process, shared by everything that needs Redis
+(response cache, rate limiting) so they reuse one connection pool.
+
+Functions:
+    get_redis() -> Optional[Redis]:
+        Return the shared client, or None when `REDIS_URL` is not configured.
+
+    close_redis() -> None:
+        Close the shared client on application shutdown.
+"""
+
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from ..conf.config import REDIS_URL
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Optional[Redis]:
+    """Return the shared client, or None when `REDIS_URL` is not configured."""
+    global _redis
+    if _redis is None and REDIS_URL:
+        # from_url не відкриває з'єднання одразу — пул підключається при першій команді
+        _redis = Redis.from_url(REDIS_URL)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared client on application shutdown."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
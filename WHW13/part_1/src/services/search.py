@@ -0,0 +1,188 @@
+"""
+Contact Search Module
+
+This module implements indexed, ranked and bounded search over contact names and emails.
+
+On PostgreSQL the search uses the `pg_trgm` GIN indexes created by the Alembic migration
+`8d4e6b21c9a3`, so `ILIKE '%q%'` is answered from the index and results are ranked by
+trigram similarity. Other backends (SQLite in development and tests) have no such index,
+so an in-process inverted n-gram index is kept instead, one per owner.
+
+Every search is limited to the contacts of one owner.
+
+Classes:
+    NGramIndex: In-memory inverted index from character n-grams to document ids.
+    ContactSearchIndex: One NGramIndex per owner, each loaded lazily from the database.
+
+Functions:
+    search_contacts(db: AsyncSession, owner_id: int, query: Optional[str], limit: int,
+                    columns: Optional[Sequence] = None) -> List:
+        Search the contacts of an owner by first name, last name or email, best matches first.
+
+Attributes:
+    contact_index (ContactSearchIndex): The process-wide fallback index.
+
+Note:
+    The fallback index lives in the memory of one process. Route handlers keep it in sync with
+    their own writes; with several workers use PostgreSQL, where the index is in the database.
+    At most `SEARCH_INDEX_MAX_OWNERS` owner indexes are kept; the least recently searched ones
+    are dropped and rebuilt when needed.
+"""
+
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..conf.config import SEARCH_INDEX_MAX_OWNERS
+from ..database.models import Contact
+
+SEARCH_FIELDS = (Contact.first_name, Contact.last_name, Contact.email)
+
+
+class NGramIndex:
+    """In-memory inverted index from character n-grams to document ids."""
+
+    def __init__(self, n: int = 3):
+        self.n = n
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._documents: Dict[int, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _grams(self, text: str) -> Set[str]:
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def add(self, doc_id: int, fields: Iterable[Optional[str]]) -> None:
+        """Index (or re-index) a document made of several text fields."""
+        self.remove(doc_id)
+        values = tuple((value or "").lower() for value in fields)
+        self._documents[doc_id] = values
+        for gram in set().union(*(self._grams(value) for value in values)):
+            self._postings[gram].add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from the index; unknown ids are ignored."""
+        values = self._documents.pop(doc_id, None)
+        if values is None:
+            return
+        for gram in set().union(*(self._grams(value) for value in values)):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def _candidates(self, query: str) -> Set[int]:
+        grams = self._grams(query)
+        if not grams:
+            # Запит коротший за n-граму: беремо всі n-грами, що його містять
+            return set().union(*(ids for gram, ids in self._postings.items() if query in gram))
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def search(self, query: str, limit: int) -> List[int]:
+        """
+        Return ids of documents containing `query` as a substring, best matches first.
+
+        A match scores higher the larger the share of the field it covers, with a bonus for
+        matching at the start of the field, so "ann" ranks "Ann" above "Joanna".
+        """
+        query = query.lower()
+        scored = []
+        for doc_id in self._candidates(query):
+            score = 0.0
+            for value in self._documents[doc_id]:
+                position = value.find(query)
+                if position >= 0:
+                    score = max(score, len(query) / len(value) + (position == 0))
+            if score:
+                scored.append((-score, doc_id))
+        scored.sort()
+        return [doc_id for _, doc_id in scored[:limit]]
+
+
+class ContactSearchIndex:
+    """One NGramIndex per owner, each loaded lazily from the database on the owner's first search."""
+
+    def __init__(self, n: int = 3, max_owners: int = SEARCH_INDEX_MAX_OWNERS):
+        self.n = n
+        self.max_owners = max_owners
+        self._owners: "OrderedDict[int, NGramIndex]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, owner_id: int) -> NGramIndex:
+        """Return the index of an owner, building it from the database if it is not loaded."""
+        index = self._owners.get(owner_id)
+        if index is None:
+            index = NGramIndex(self.n)
+            stmt = select(Contact.id, *SEARCH_FIELDS).where(Contact.owner_id == owner_id)
+            result = await db.stream(stmt.execution_options(yield_per=1000))
+            async for row in result:
+                index.add(row[0], row[1:])
+            self._owners[owner_id] = index
+            while len(self._owners) > self.max_owners:
+                self._owners.popitem(last=False)
+        self._owners.move_to_end(owner_id)
+        return index
+
+    def add_contact(self, contact: Contact) -> None:
+        """Index a created or updated contact; a no-op until its owner's index is loaded."""
+        index = self._owners.get(contact.owner_id)
+        if index is not None:
+            index.add(contact.id, (getattr(contact, field.key) for field in SEARCH_FIELDS))
+
+    def remove_contact(self, owner_id: int, contact_id: int) -> None:
+        """Drop a deleted contact; a no-op until its owner's index is loaded."""
+        index = self._owners.get(owner_id)
+        if index is not None:
+            index.remove(contact_id)
+
+    def invalidate(self, owner_id: int) -> None:
+        """Discard an owner's index after bulk writes; it is rebuilt on the owner's next search."""
+        self._owners.pop(owner_id, None)
+
+
+contact_index = ContactSearchIndex()
+
+
+async def _fetch(db: AsyncSession, stmt, columns: Optional[Sequence]) -> List:
+    if columns:
+        return (await db.execute(stmt)).all()
+    return (await db.scalars(stmt)).all()
+
+
+async def search_contacts(
+    db: AsyncSession,
+    owner_id: int,
+    query: Optional[str],
+    limit: int,
+    columns: Optional[Sequence] = None,
+) -> List:
+    """
+    Search the contacts of an owner by first name, last name or email, best matches first.
+
+    Returns `Contact` objects, or rows of `columns` (which must include `Contact.id`) if given.
+    """
+    target = (select(*columns) if columns else select(Contact)).where(Contact.owner_id == owner_id)
+    if not query:
+        return await _fetch(db, target.order_by(Contact.id).limit(limit), columns)
+
+    if db.get_bind().dialect.name == "postgresql":
+        pattern = f"%{query}%"
+        rank = func.greatest(*(func.similarity(field, query) for field in SEARCH_FIELDS))
+        stmt = (
+            target
+            .where(or_(*(field.ilike(pattern) for field in SEARCH_FIELDS)))
+            .order_by(rank.desc(), Contact.id)
+            .limit(limit)
+        )
+        return await _fetch(db, stmt, columns)
+
+    index = await contact_index.get(db, owner_id)
+    ids = index.search(query, limit)
+    if not ids:
+        return []
+    contacts = {contact.id: contact for contact in await _fetch(db, target.where(Contact.id.in_(ids)), columns)}
+    return [contacts[contact_id] for contact_id in ids if contact_id in contacts]
@@ -0,0 +1,136 @@
+"""
+Contact Serialization Module
+
+This module implements the fast response path of the contact endpoints and sparse fieldsets.
+
+The regular path loads `Contact` objects, and FastAPI validates every one of them against the
+response model and runs it through `jsonable_encoder` before the JSON encoder sees it. For rows
+read from our own database this only repeats what the columns already guarantee. With
+`CONTACT_FAST_JSON` enabled the list endpoints instead select just the response columns as row
+tuples, turn them into plain dicts and hand those to `ORJSONResponse` unvalidated.
+
+A `fields=first_name,phone_number` query parameter selects a sparse fieldset: only those columns
+(and always `id`) are read from the database and returned. Sparse bodies are partial contacts, so
+they always take the fast path instead of the response model.
+
+Functions:
+    contact_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        FastAPI dependency parsing the `fields` query parameter.
+
+    fields_key(fields: Optional[Tuple[str, ...]]) -> str:
+        Stable name of a fieldset for cache keys.
+
+    fieldset_tag(fields: Optional[Tuple[str, ...]]) -> str:
+        Short suffix distinguishing the ETags of sparse representations.
+
+    field_columns(fields: Optional[Tuple[str, ...]]) -> Tuple[Column, ...]:
+        Columns to select for a fieldset.
+
+    contact_dicts(rows: Iterable[Row], fields: Optional[Tuple[str, ...]] = None) -> List[dict]:
+        Plain dicts of contact rows selected with `field_columns`.
+
+    contact_dict(contact: Contact, fields: Tuple[str, ...]) -> dict:
+        Plain dict of the given fields of a (partially loaded) contact.
+
+    contacts_response(body: Any, response: Response, sparse: bool = False) -> Union[Any, ORJSONResponse]:
+        Return a body through the response model, or straight through orjson.
+
+Attributes:
+    CONTACT_COLUMNS (tuple): Columns of `ContactResponse`, in the order of its fields.
+
+Note:
+    Only the JSON encoding is skipped on the fast path, not the content: the dicts hold the same
+    keys and values the response model would produce.
+"""
+
+import zlib
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
+
+from ..conf.config import CONTACT_FAST_JSON
+from ..database.models import Contact
+
+CONTACT_COLUMNS = (
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone_number,
+    Contact.birthday,
+    Contact.additional_data,
+    Contact.id,
+)
+CONTACT_KEYS = tuple(column.key for column in CONTACT_COLUMNS)
+CONTACT_FIELDS = dict(zip(CONTACT_KEYS, CONTACT_COLUMNS))
+
+
+def contact_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated contact fields to return, e.g. first_name,phone_number; id is always included.",
+    ),
+) -> Optional[Tuple[str, ...]]:
+    """
+    FastAPI dependency parsing the `fields` query parameter.
+
+    Returns:
+        Optional[Tuple[str, ...]]: The requested fields plus `id`, in response order; None for all fields.
+
+    Raises:
+        HTTPException: 400 for unknown field names.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - CONTACT_FIELDS.keys()
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    # Однаковий порядок для будь-якого запису fields=, щоб ключі кешу збігалися
+    return tuple(key for key in CONTACT_KEYS if key in requested)
+
+
+def fields_key(fields: Optional[Tuple[str, ...]]) -> str:
+    """Stable name of a fieldset for cache keys; "*" for all fields."""
+    return ",".join(fields) if fields else "*"
+
+
+def fieldset_tag(fields: Optional[Tuple[str, ...]]) -> str:
+    """Short suffix distinguishing the ETag of a sparse representation; empty for all fields."""
+    return f".{zlib.crc32(fields_key(fields).encode()):08x}" if fields else ""
+
+
+def field_columns(fields: Optional[Tuple[str, ...]]) -> tuple:
+    """Columns to select for a fieldset, in response order; all of `CONTACT_COLUMNS` for None."""
+    return tuple(CONTACT_FIELDS[key] for key in fields) if fields else CONTACT_COLUMNS
+
+
+def contact_dicts(rows: Iterable, fields: Optional[Tuple[str, ...]] = None) -> List[dict]:
+    """
+    Plain dicts of contact rows selected with `field_columns(fields)`.
+
+    Columns selected after those (e.g. `version` for ETags) are left out.
+    """
+    keys = fields or CONTACT_KEYS
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def contact_dict(contact: Contact, fields: Tuple[str, ...]) -> dict:
+    """Plain dict of the given fields of a contact loaded with `load_only(*field_columns(fields))`."""
+    return {key: getattr(contact, key) for key in fields}
+
+
+def contacts_response(body: Any, response: Response, sparse: bool = False) -> Union[Any, ORJSONResponse]:
+    """
+    Return a body through the response model, or straight through orjson.
+
+    The fast path is taken with `CONTACT_FAST_JSON` and always for sparse fieldsets, which the
+    response model would reject. Headers already set on `response` (rate limit, ETag) are carried
+    over to the fast response.
+    """
+    if not (CONTACT_FAST_JSON or sparse):
+        return body
+    fast = ORJSONResponse(body)
+    fast.raw_headers.extend(response.raw_headers)
+    return fast
@@ -0,0 +1,246 @@
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+from uuid import uuid4
+
+# Як і бенчмарки, тести працюють на тимчасовій SQLite; Redis і ліміти запитів вимкнені,
+# тож кеш відповідей — це внутрішньопроцесний MemoryCache
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ["REDIS_URL"] = ""
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+for name in ("SECRET_KEY", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET", "CLOUDINARY_CLOUD_NAME"):
+    os.environ.setdefault(name, "test")
+
+from aiosmtpd.controller import Controller  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from .database.db import SessionLocal  # noqa: E402
+from .database.models import User  # noqa: E402
+from .repository import contacts as contacts_repository  # noqa: E402
+from .routes import contacts, metrics  # noqa: E402
+from .routes.token import create_access_token  # noqa: E402
+from .services.cache import MemoryCache  # noqa: E402
+from .services.mail import MailQueue  # noqa: E402
+
+
+def contact_data(**changes):
+    data = {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com", "phone_number": "+380000000001"}
+    data.update(changes)
+    return data
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class SMTPStandIn:
+    """aiosmtpd handler that answers DATA with queued replies (then 250) and records delivered mail."""
+
+    def __init__(self):
+        self.replies = []
+        self.delivered = []
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.replies:
+            return self.replies.pop(0)
+        self.delivered.append(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+class MemoryCacheTests(IsolatedAsyncioTestCase):
+    async def test_entries_expire_after_ttl(self):
+        cache = MemoryCache(ttl=10)
+        await cache.set("contacts:1", "list", [1])
+        with mock.patch("src.services.cache.time.monotonic", return_value=time.monotonic() + 11):
+            self.assertIsNone(await cache.get("contacts:1", "list"))
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = MemoryCache(max_entries=2)
+        await cache.set("contacts:1", "a", 1)
+        await cache.set("contacts:1", "b", 2)
+        await cache.get("contacts:1", "a")
+        await cache.set("contacts:1", "c", 3)
+        self.assertEqual(await cache.get("contacts:1", "a"), 1)
+        self.assertIsNone(await cache.get("contacts:1", "b"))
+        self.assertEqual(await cache.get("contacts:1", "c"), 3)
+
+    async def test_invalidate_drops_only_its_namespace(self):
+        cache = MemoryCache()
+        await cache.set("contacts:1", "list", [1])
+        await cache.set("contacts:2", "list", [2])
+        await cache.invalidate("contacts:1")
+        self.assertIsNone(await cache.get("contacts:1", "list"))
+        self.assertEqual(await cache.get("contacts:2", "list"), [2])
+
+
+class ContactCacheInvalidationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        app = FastAPI()
+        app.include_router(contacts.router, prefix="/api")
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        # Кожен тест має власного користувача, а отже й власний простір імен кешу
+        email = f"{uuid4().hex}@example.com"
+        with SessionLocal() as db:
+            db.add(User(email=email, hashed_password="unused"))
+            db.commit()
+        self.headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+        self.contact = self.client.post("/api/contacts/", json=contact_data(), headers=self.headers).json()
+
+    def get(self, path):
+        response = self.client.get(path, headers=self.headers)
+        return response.status_code, response.json()
+
+    def test_repeated_reads_are_served_from_cache(self):
+        with mock.patch.object(contacts_repository, "list_contacts", wraps=contacts_repository.list_contacts) as listing:
+            first = self.get("/api/contacts/")
+            second = self.get("/api/contacts/")
+        self.assertEqual(first, second)
+        self.assertEqual(listing.call_count, 1)
+
+    def test_create_invalidates_cached_list(self):
+        self.assertEqual(len(self.get("/api/contacts/")[1]), 1)
+        self.client.post("/api/contacts/", json=contact_data(email="grace@example.com"), headers=self.headers)
+        self.assertEqual(len(self.get("/api/contacts/")[1]), 2)
+
+    def test_update_invalidates_cached_contact_and_list(self):
+        path = f"/api/contacts/{self.contact['id']}"
+        self.get(path)
+        self.get("/api/contacts/")
+        self.client.put(path, json=contact_data(first_name="Augusta"), headers=self.headers)
+        self.assertEqual(self.get(path)[1]["first_name"], "Augusta")
+        self.assertEqual(self.get("/api/contacts/")[1][0]["first_name"], "Augusta")
+
+        self.client.patch(path, json={"last_name": "King"}, headers=self.headers)
+        self.assertEqual(self.get(path)[1]["last_name"], "King")
+
+    def test_delete_invalidates_cached_contact_and_list(self):
+        path = f"/api/contacts/{self.contact['id']}"
+        self.get(path)
+        self.get("/api/contacts/")
+        self.client.delete(path, headers=self.headers)
+        self.assertEqual(self.get(path)[0], 404)
+        self.assertEqual(self.get("/api/contacts/")[1], [])
+
+
+class MailQueueTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.smtp = SMTPStandIn()
+        port = free_port()
+        controller = Controller(self.smtp, hostname="127.0.0.1", port=port)
+        controller.start()
+        self.addCleanup(controller.stop)
+        settings = mock.patch.multiple(
+            "src.services.mail",
+            MAIL_SERVER="127.0.0.1",
+            MAIL_PORT=port,
+            MAIL_USERNAME="",
+            MAIL_FROM="noreply@example.com",
+            MAIL_STARTTLS=False,
+            MAIL_SSL_TLS=False,
+            MAIL_RETRY_BACKOFF=0.01,
+            MAIL_RETRY_BACKOFF_MAX=0.03,
+        )
+        settings.start()
+        self.addCleanup(settings.stop)
+
+    async def run_queue(self, queue, condition):
+        queue.start()
+        try:
+            await wait_until(condition)
+        finally:
+            await queue.stop(timeout=1)
+
+    async def test_batch_is_sent_over_one_connection(self):
+        queue = MailQueue(workers=1)
+        for i in range(3):
+            queue.enqueue(f"user{i}@example.com", "Email Verification", "Your verification code: 123456")
+        await self.run_queue(queue, lambda: queue.sent == 3)
+        self.assertEqual(self.smtp.delivered, [[f"user{i}@example.com"] for i in range(3)])
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(queue.failed, 0)
+
+    async def test_transient_failure_is_retried(self):
+        self.smtp.replies = ["451 Try again later", "451 Try again later"]
+        queue = MailQueue(workers=1, max_attempts=5)
+        queue.enqueue("user@example.com", "Email Verification", "code")
+        await self.run_queue(queue, lambda: queue.sent == 1)
+        self.assertEqual(queue.retried, 2)
+        self.assertEqual(self.smtp.delivered, [["user@example.com"]])
+
+    async def test_retries_back_off_exponentially_then_dead_letter(self):
+        self.smtp.replies = ["451 Try again later"] * 4
+        queue = MailQueue(workers=1, max_attempts=4)
+        queue.enqueue("user@example.com", "Email Verification", "code")
+        loop = asyncio.get_running_loop()
+        with mock.patch("src.services.mail.random.uniform", return_value=1.0), \
+                mock.patch.object(loop, "call_later", wraps=loop.call_later) as call_later:
+            await self.run_queue(queue, lambda: queue.failed == 1)
+        # 0.01, подвоєння на кожній спробі, обмежене MAIL_RETRY_BACKOFF_MAX
+        delays = [call.args[0] for call in call_later.call_args_list if call.args[1].__name__ == "requeue"]
+        self.assertEqual(delays, [0.01, 0.02, 0.03])
+        self.assertEqual(queue.retried, 3)
+        self.assertEqual(queue.sent, 0)
+        self.assertEqual(queue.dead_letters[0].attempts, 4)
+
+    async def test_permanent_failure_is_dead_lettered_without_retry(self):
+        self.smtp.replies = ["554 Message rejected"]
+        queue = MailQueue(workers=1)
+        queue.enqueue("user@example.com", "Email Verification", "code")
+        await self.run_queue(queue, lambda: queue.failed == 1)
+        self.assertEqual(queue.retried, 0)
+        dead_letter = queue.snapshot()["dead_letters"][0]
+        self.assertEqual(dead_letter["attempts"], 1)
+        self.assertNotIn("recipient", dead_letter)
+
+    async def test_full_queue_dead_letters_the_message(self):
+        queue = MailQueue(maxsize=1)
+        self.assertTrue(queue.enqueue("first@example.com", "Subject", "body"))
+        self.assertFalse(queue.enqueue("second@example.com", "Subject", "body"))
+        self.assertEqual(queue.dead_letters[0].error, "Mail queue is full")
+        await queue.stop()
+        self.assertEqual(queue.failed, 2)
+
+
+class MetricsAccessTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        app = FastAPI()
+        app.include_router(metrics.router, prefix="/api")
+        cls.client = TestClient(app)
+
+    def test_metrics_are_disabled_without_token(self):
+        with mock.patch.object(metrics, "METRICS_TOKEN", ""):
+            self.assertEqual(self.client.get("/api/metrics/pool/").status_code, 404)
+
+    def test_metrics_require_the_configured_token(self):
+        with mock.patch.object(metrics, "METRICS_TOKEN", "secret"):
+            self.assertEqual(self.client.get("/api/metrics/mail/").status_code, 401)
+            wrong = {"Authorization": "Bearer wrong"}
+            self.assertEqual(self.client.get("/api/metrics/mail/", headers=wrong).status_code, 401)
+            right = {"Authorization": "Bearer secret"}
+            self.assertEqual(self.client.get("/api/metrics/mail/", headers=right).status_code, 200)
@@ -0,0 +1,146 @@
+"""
+Database Connections Benchmark
+
+Shows how many database connections a page opens per request and what that costs in latency
+under different connection settings:
+
+* "per request": DB_CONN_MAX_AGE=0, Django's default — connect on every request;
+* "persistent": DB_CONN_MAX_AGE=60 with DB_CONN_HEALTH_CHECKS — a thread reuses its connection.
+
+Every scenario runs in its own process with its settings in the environment. Requests go through
+Django's WSGI handler, so connections are closed or kept at the end of each request exactly as
+under a real server; the worker threads stand in for the server's threads.
+
+Usage:
+    python -m benchmarks.db_connections [--path /detail/1] [--requests 1000] [--threads 8]
+
+    Run from the project directory against a migrated database. The database is selected by the
+    DB_* settings (.env), e.g. DB_ENGINE=django.db.backends.sqlite3 DB_NAME=/tmp/bench.sqlite3 for
+    a local stand-in; the connection cost is only realistic against PostgreSQL.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from io import BytesIO
+from urllib.parse import urlsplit
+
+SCENARIOS = {
+    "per request": {"DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_CONN_MAX_AGE": "60", "DB_CONN_HEALTH_CHECKS": "True"},
+}
+
+
+def request_environ(path: str) -> dict:
+    url = urlsplit(path)
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "SERVER_NAME": "bench",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "bench",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+    }
+
+
+def measure(path: str, requests: int, threads: int) -> dict:
+    """Serve `requests` GETs of `path` from `threads` threads; return connections and latencies."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notes.settings")
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+    from django.test.utils import override_settings
+
+    application = get_wsgi_application()
+    connections, latencies, lock = [0], [], threading.Lock()
+
+    def count_connection(sender, **kwargs):
+        with lock:
+            connections[0] += 1
+
+    def one() -> float:
+        statuses = []
+        started = time.perf_counter()
+        response = application(request_environ(path), lambda status, headers: statuses.append(status))
+        try:
+            b"".join(response)
+        finally:
+            # close() надсилає request_finished, де Django закриває або лишає з'єднання
+            response.close()
+        elapsed = time.perf_counter() - started
+        if not statuses[0].startswith("200"):
+            raise RuntimeError(f"GET {path} returned {statuses[0]}")
+        return elapsed
+
+    def worker(count: int) -> None:
+        timings = [one() for _ in range(count)]
+        with lock:
+            latencies.extend(timings)
+
+    with override_settings(ALLOWED_HOSTS=["bench"]):
+        one()  # прогрів: імпорти, шаблони, URL-резолвер
+        connection_created.connect(count_connection)
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(requests // threads + (i < requests % threads),))
+                for i in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "connections": connections[0],
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> dict:
+    """Run one scenario in a child process, so that the settings are read from its environment."""
+    env = {**os.environ, **SCENARIOS[name]}
+    command = [
+        sys.executable, "-m", "benchmarks.db_connections", "--measure",
+        "--path", args.path, "--requests", str(args.requests), "--threads", str(args.threads),
+    ]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Scenario {name!r} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default="/detail/1")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--measure", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.path, args.requests, args.threads)))
+        return
+
+    print(f"GET {args.path}: {args.requests} requests from {args.threads} threads")
+    print(f"{'scenario':<12} {'conns':>7} {'conns/req':>10} {'req/s':>9} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for name in SCENARIOS:
+        stats = run_scenario(name, args)
+        print(
+            f"{name:<12} {stats['connections']:>7} {stats['connections'] / stats['requests']:>10.3f} "
+            f"{stats['rps']:>9.1f} {stats['mean_ms']:>9.2f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from django.contrib import admin
-from .models import Author, Quote
-
-# Register your models here.
-admin.site.register(Author)
+from django.contrib import admin
+from .models import Author, Quote
+
+# Register your models here.
+admin.site.register(Author)
 admin.site.register(Quote)
\ No newline at end of file
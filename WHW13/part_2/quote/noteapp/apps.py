@@ -1,6 +1,9 @@
-from django.apps import AppConfig
-
-
-class NoteappConfig(AppConfig):
-    default_auto_field = "django.db.models.BigAutoField"
-    name = "noteapp"
+from django.apps import AppConfig
+
+
+class NoteappConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "noteapp"
+
+    def ready(self):
+        from . import signals  # noqa: F401  реєструє обробники сигналів
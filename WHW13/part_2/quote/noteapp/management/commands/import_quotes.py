@@ -0,0 +1,113 @@
+import csv
+import json
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from noteapp.models import Author, Quote, link_authors
+from noteapp.search import quote_index
+from noteapp.signals import invalidate_quote_pages
+
+
+def read_json(path):
+    with open(path, encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, list):
+        raise CommandError('JSON file must contain a list of quotes')
+    for item in data:
+        if not isinstance(item, dict):
+            # Не об'єкт: authors=None, тож clean() відкине рядок і врахує його як пропущений
+            yield '', '', None
+            continue
+        authors = item.get('authors', item.get('author', []))
+        yield item.get('name', ''), item.get('description', ''), [authors] if isinstance(authors, str) else authors
+
+
+def read_csv(path, separator):
+    with open(path, encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            authors = row.get('authors') or ''
+            yield row.get('name') or '', row.get('description') or '', authors.split(separator)
+
+
+class Command(BaseCommand):
+    help = (
+        'Import quotes with their authors from a JSON list of {"name", "description", "authors"} objects '
+        'or a CSV file with name, description and authors columns. Authors that do not exist yet are created.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON or CSV file with quotes')
+        parser.add_argument('--format', choices=['json', 'csv'], help='File format; guessed from the extension by default')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Quotes written per INSERT (default: 1000)')
+        parser.add_argument('--author-separator', default=';', help='Separator of author names in the CSV authors column')
+
+    def handle(self, *args, path, format, batch_size, author_separator, **options):
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+        fmt = format or Path(path).suffix.lstrip('.').lower()
+        if fmt == 'json':
+            rows = read_json(path)
+        elif fmt == 'csv':
+            rows = read_csv(path, author_separator)
+        else:
+            raise CommandError(f'Cannot guess the format of {path}; pass --format json or --format csv')
+
+        self.author_ids = dict(Author.objects.values_list('name', 'id'))
+        self.quotes = self.created_authors = self.skipped = 0
+        # Увесь імпорт — одна транзакція: файл з помилкою не лишає половини цитат
+        with transaction.atomic():
+            rows = iter(enumerate(rows, start=1))
+            while batch := list(islice(rows, batch_size)):
+                self.import_batch(batch)
+            # bulk_create не надсилає сигналів, тож кеш сторінок і запасний пошуковий індекс скидаємо явно
+            invalidate_quote_pages()
+            transaction.on_commit(quote_index.reset)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {self.quotes} quotes, created {self.created_authors} authors, skipped {self.skipped} rows'
+        ))
+
+    def clean(self, number, name, description, authors):
+        if not isinstance(authors, list):
+            self.stderr.write(f'Row {number} skipped: expected an object with a list or string of authors')
+            self.skipped += 1
+            return None
+        name, description = str(name).strip(), str(description).strip()
+        authors = list(dict.fromkeys(str(author).strip() for author in authors if str(author).strip()))
+        name_field, description_field = Quote._meta.get_field('name'), Quote._meta.get_field('description')
+        author_length = Author._meta.get_field('name').max_length
+        if not name or len(name) > name_field.max_length:
+            problem = f'name must have 1-{name_field.max_length} characters'
+        elif not description or len(description) > description_field.max_length:
+            problem = f'description must have 1-{description_field.max_length} characters'
+        elif any(len(author) > author_length for author in authors):
+            problem = f'author names must have at most {author_length} characters'
+        else:
+            return name, description, authors
+        self.stderr.write(f'Row {number} skipped: {problem}')
+        self.skipped += 1
+        return None
+
+    def import_batch(self, batch):
+        rows = [row for row in (self.clean(number, *fields) for number, fields in batch) if row]
+        if not rows:
+            return
+
+        # Нових авторів пакета створюємо одним INSERT, а їхні id читаємо одним SELECT
+        new_names = {author for _, _, authors in rows for author in authors} - self.author_ids.keys()
+        if new_names:
+            Author.objects.bulk_create([Author(name=name) for name in new_names], ignore_conflicts=True)
+            self.author_ids.update(Author.objects.filter(name__in=new_names).values_list('name', 'id'))
+            self.created_authors += len(new_names)
+
+        # PostgreSQL і SQLite повертають id вставлених рядків, тож зв'язки пишемо без перечитування
+        quotes = Quote.objects.bulk_create([Quote(name=name, description=description) for name, description, _ in rows])
+        link_authors(
+            (quote.id, self.author_ids[author])
+            for quote, (_, _, authors) in zip(quotes, rows)
+            for author in authors
+        )
+        self.quotes += len(quotes)
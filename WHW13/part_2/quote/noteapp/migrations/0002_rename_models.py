@@ -0,0 +1,12 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("noteapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RenameModel(old_name="Tag", new_name="Author"),
+        migrations.RenameModel(old_name="Note", new_name="Quote"),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("noteapp", "0002_rename_models"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="quote",
+            index=models.Index(fields=["created", "id"], name="quote_created_id_idx"),
+        ),
+    ]
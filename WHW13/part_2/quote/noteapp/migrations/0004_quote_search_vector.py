@@ -0,0 +1,58 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Тригер оновлює search_vector при кожному INSERT/UPDATE name чи description, зокрема й при
+# bulk_create, який не надсилає сигналів. Конфігурація та сама, що в noteapp.search.SEARCH_CONFIG
+POSTGRES_FORWARD = [
+    "CREATE INDEX quote_search_vector_idx ON noteapp_quote USING gin (search_vector)",
+    """
+    CREATE TRIGGER quote_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, description ON noteapp_quote
+    FOR EACH ROW EXECUTE FUNCTION
+    tsvector_update_trigger(search_vector, 'pg_catalog.english', name, description)
+    """,
+    "UPDATE noteapp_quote SET search_vector = to_tsvector('pg_catalog.english', name || ' ' || description)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER IF EXISTS quote_search_vector_update ON noteapp_quote",
+    "DROP INDEX IF EXISTS quote_search_vector_idx",
+]
+
+
+def postgres_only(statements):
+    # На SQLite немає ні GIN-індексів, ні tsvector; там працює запасний індекс у пам'яті
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for statement in statements:
+                schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("noteapp", "0003_quote_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quote",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="quote",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="quote_search_vector_idx"
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(postgres_only(POSTGRES_FORWARD), postgres_only(POSTGRES_BACKWARD)),
+            ],
+        ),
+    ]
@@ -1,20 +1,42 @@
-from django.db import models
-
-
-# Create your models here.
-class Author(models.Model):
-    name = models.CharField(max_length=25, null=False, unique=True)
-
-    def __str__(self):
-        return f"{self.name}"
-
-
-class Quote(models.Model):
-    name = models.CharField(max_length=50, null=False)
-    description = models.CharField(max_length=150, null=False)
-    done = models.BooleanField(default=False)
-    created = models.DateTimeField(auto_now_add=True)
-    tags = models.ManyToManyField(Author)
-
-    def __str__(self):
-        return f"{self.name}"
\ No newline at end of file
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+# Create your models here.
+class Author(models.Model):
+    name = models.CharField(max_length=25, null=False, unique=True)
+
+    def __str__(self):
+        return f"{self.name}"
+
+
+class Quote(models.Model):
+    name = models.CharField(max_length=50, null=False)
+    description = models.CharField(max_length=150, null=False)
+    done = models.BooleanField(default=False)
+    created = models.DateTimeField(auto_now_add=True)
+    tags = models.ManyToManyField(Author)
+    # name і description для повнотекстового пошуку; на PostgreSQL заповнює тригер (міграція 0004)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Ключ сторінок списку: від найновіших, (created, id) для однозначного порядку
+            models.Index(fields=['created', 'id'], name='quote_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='quote_search_vector_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name}"
+
+
+def link_authors(links):
+    # Усі зв'язки цитата–автор записуються одним INSERT у проміжну таблицю;
+    # ignore_conflicts пропускає пари, які вже є. bulk_create не надсилає m2m_changed,
+    # тож кеш сторінок скидає той, хто викликає функцію (див. signals.invalidate_quote_pages)
+    through = Quote.tags.through
+    through.objects.bulk_create(
+        [through(quote_id=quote_id, author_id=author_id) for quote_id, author_id in links],
+        ignore_conflicts=True,
+    )
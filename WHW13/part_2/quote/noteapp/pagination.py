@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+def encode_cursor(quote):
+    key = json.dumps([quote.created.isoformat(), quote.id])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        created, quote_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created), int(quote_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+class QuotePage:
+    # Сторінка цитат від найновіших, з курсором за ключем (created, id) замість OFFSET:
+    # кожна наступна сторінка читається з індексу так само швидко, як перша.
+    # Запит виконується лише при першому зверненні до quotes/next_cursor, тож сторінка,
+    # яку шаблон бере з кешу, до бази не звертається.
+
+    def __init__(self, queryset, size, cursor=None):
+        self.queryset = queryset
+        self.size = size
+        self.cursor = cursor
+        self.after = decode_cursor(cursor) if cursor else None
+
+    @cached_property
+    def rows(self):
+        queryset = self.queryset
+        if self.after:
+            created, quote_id = self.after
+            queryset = queryset.filter(Q(created__lt=created) | Q(created=created, id__lt=quote_id))
+        # Один зайвий рядок показує, чи є наступна сторінка
+        return list(queryset[:self.size + 1])
+
+    @property
+    def quotes(self):
+        return self.rows[:self.size]
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.rows[self.size - 1]) if len(self.rows) > self.size else None
@@ -0,0 +1,96 @@
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+
+from .models import Quote
+
+# Конфігурація текстового пошуку PostgreSQL; та сама, що в тригері міграції 0004
+SEARCH_CONFIG = 'english'
+
+WORD = re.compile(r'\w+')
+
+
+def words(text):
+    return [word.casefold() for word in WORD.findall(text)]
+
+
+class InvertedIndex:
+    # Запасний пошук для SQLite: слово -> {id цитати: скільки разів воно трапляється}.
+    # Будується з бази при першому пошуку, далі оновлюється сигналами після commit.
+    # Живе в пам'яті одного процесу, тож це засіб для розробки, а не для кількох воркерів
+
+    def __init__(self):
+        self._postings = None
+        self._documents = {}
+        self._lock = threading.Lock()
+
+    def _add(self, quote_id, name, description):
+        counts = Counter(words(f'{name} {description}'))
+        for word, count in counts.items():
+            self._postings[word][quote_id] = count
+        self._documents[quote_id] = tuple(counts)
+
+    def _remove(self, quote_id):
+        for word in self._documents.pop(quote_id, ()):
+            quotes = self._postings[word]
+            del quotes[quote_id]
+            if not quotes:
+                del self._postings[word]
+
+    def _load(self):
+        with self._lock:
+            if self._postings is None:
+                self._postings, self._documents = defaultdict(dict), {}
+                for quote_id, name, description in Quote.objects.values_list('id', 'name', 'description').iterator():
+                    self._add(quote_id, name, description)
+            return self._postings
+
+    def search(self, query):
+        # Як websearch у PostgreSQL: цитата має містити всі слова запиту
+        terms = set(words(query))
+        if not terms:
+            return {}
+        postings = self._load()
+        with self._lock:
+            matches = [dict(postings.get(term, {})) for term in terms]
+        ids = set.intersection(*(set(match) for match in matches))
+        return {quote_id: sum(match[quote_id] for match in matches) for quote_id in ids}
+
+    def update(self, quote):
+        with self._lock:
+            if self._postings is not None:
+                self._remove(quote.id)
+                self._add(quote.id, quote.name, quote.description)
+
+    def remove(self, quote_id):
+        with self._lock:
+            if self._postings is not None:
+                self._remove(quote_id)
+
+    def reset(self):
+        with self._lock:
+            self._postings, self._documents = None, {}
+
+
+quote_index = InvertedIndex()
+
+
+def search_quotes(queryset, query, limit):
+    if connection.vendor == 'postgresql':
+        # search_vector підтримує тригер бази, пошук іде GIN-індексом без сканування таблиці
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+        return list(
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-created', '-id')[:limit]
+        )
+
+    scores = quote_index.search(query)
+    if not scores:
+        return []
+    quotes = queryset.filter(id__in=scores)
+    return sorted(quotes, key=lambda quote: (-scores[quote.id], -quote.created.timestamp(), -quote.id))[:limit]
@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Author, Quote
+from .search import quote_index
+
+QUOTE_PAGES_VERSION_KEY = 'noteapp:quote_pages:version'
+
+
+def quote_pages_version():
+    # Версія входить у ключ кешу кожної сторінки списку; нова версія робить старі записи недосяжними
+    return cache.get_or_set(QUOTE_PAGES_VERSION_KEY, 1, timeout=None)
+
+
+def bump_quote_pages_version():
+    try:
+        cache.incr(QUOTE_PAGES_VERSION_KEY)
+    except ValueError:
+        cache.set(QUOTE_PAGES_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_quote_pages():
+    # Після commit, інакше паралельний запит встиг би закешувати сторінку зі старого знімка бази.
+    # bulk_create не надсилає сигналів, тож масові записи викликають цю функцію самі
+    transaction.on_commit(bump_quote_pages_version)
+
+
+@receiver(post_save, sender=Quote)
+@receiver(post_delete, sender=Quote)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(m2m_changed, sender=Quote.tags.through)
+def quote_changed(sender, **kwargs):
+    invalidate_quote_pages()
+
+
+@receiver(post_save, sender=Quote)
+def index_quote(sender, instance, **kwargs):
+    # Запасний пошуковий індекс (SQLite); на PostgreSQL search_vector оновлює тригер
+    transaction.on_commit(lambda: quote_index.update(instance))
+
+
+@receiver(post_delete, sender=Quote)
+def unindex_quote(sender, instance, **kwargs):
+    quote_id = instance.id
+    transaction.on_commit(lambda: quote_index.remove(quote_id))
@@ -0,0 +1,12 @@
+from django import template
+
+register = template.Library()
+
+
+def author(quote_authors):
+    # .all() бере автори з кешу prefetch_related('tags'), тож на сторінці списку
+    # фільтр не робить окремого запиту на кожну цитату
+    return ', '.join([str(name) for name in quote_authors.all()])
+
+
+register.filter('author', author)
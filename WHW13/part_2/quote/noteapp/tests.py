@@ -1,3 +1,210 @@
-from django.test import TestCase
-
-# Create your tests here.
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import Author, Quote
+from .search import quote_index
+from .views import quote_list_queryset
+
+QUOTE_LIST = Template('{% load extract_tags %}{% for quote in quotes %}{{ quote.name }}: {{ quote.tags|author }}\n{% endfor %}')
+
+
+def create_quotes(count, authors):
+    for i in range(count):
+        quote = Quote.objects.create(name=f'Quote {i}', description=f'Description of quote {i}')
+        quote.tags.set(authors)
+
+
+class QuoteQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [Author.objects.create(name=name) for name in ('Albert Einstein', 'Mark Twain')]
+
+    def render_list(self):
+        return QUOTE_LIST.render(Context({'quotes': quote_list_queryset()}))
+
+    def test_list_query_count_does_not_grow_with_quotes(self):
+        # Один запит на цитати й один на авторів усіх цитат — і для 3, і для 30 цитат
+        create_quotes(3, self.authors)
+        with self.assertNumQueries(2):
+            self.render_list()
+
+        create_quotes(27, self.authors)
+        with self.assertNumQueries(2):
+            rendered = self.render_list()
+        self.assertEqual(rendered.count('Albert Einstein, Mark Twain'), 30)
+
+    def test_detail_renders_authors_with_constant_queries(self):
+        create_quotes(1, self.authors)
+        quote = Quote.objects.get()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('noteapp:detail', args=[quote.id]))
+        self.assertContains(response, 'Albert Einstein, Mark Twain')
+
+    def test_detail_of_missing_quote_is_404(self):
+        response = self.client.get(reverse('noteapp:detail', args=[1]))
+        self.assertEqual(response.status_code, 404)
+
+
+class QuoteCreationTests(TestCase):
+    def test_quote_view_links_authors_in_one_insert(self):
+        for name in ('Albert Einstein', 'Mark Twain', 'Oscar Wilde'):
+            Author.objects.create(name=name)
+        data = {'name': 'On imagination', 'description': 'Imagination is more important', 'author': ['Albert Einstein', 'Mark Twain']}
+        # INSERT цитати, SELECT авторів, один INSERT зв'язків і точки збереження транзакції
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('noteapp:quote'), data)
+        self.assertRedirects(response, reverse('noteapp:main'))
+        quote = Quote.objects.get()
+        self.assertEqual(sorted(quote.tags.values_list('name', flat=True)), ['Albert Einstein', 'Mark Twain'])
+
+
+class ImportQuotesCommandTests(TestCase):
+    def write(self, name, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def test_import_json_in_batches(self):
+        Author.objects.create(name='Mark Twain')
+        quotes = [
+            {'name': f'Quote {i}', 'description': f'Description of quote {i}', 'authors': ['Mark Twain', f'Author {i % 3}']}
+            for i in range(10)
+        ]
+        quotes.append({'name': '', 'description': 'No name', 'authors': []})
+        out, err = StringIO(), StringIO()
+        call_command('import_quotes', self.write('quotes.json', json.dumps(quotes)), batch_size=4, stdout=out, stderr=err)
+
+        self.assertIn('Imported 10 quotes, created 3 authors, skipped 1 rows', out.getvalue())
+        self.assertIn('Row 11 skipped', err.getvalue())
+        self.assertEqual(Quote.objects.count(), 10)
+        self.assertEqual(Author.objects.count(), 4)
+        self.assertEqual(Quote.tags.through.objects.count(), 20)
+        self.assertEqual(
+            sorted(Quote.objects.get(name='Quote 4').tags.values_list('name', flat=True)),
+            ['Author 1', 'Mark Twain'],
+        )
+
+    def test_import_json_skips_malformed_items(self):
+        quotes = [
+            {'name': 'Quote', 'description': 'Description of quote', 'authors': 'Mark Twain'},
+            'oops',
+            {'name': 'Bad authors', 'description': 'Authors is a number', 'authors': 42},
+        ]
+        out, err = StringIO(), StringIO()
+        call_command('import_quotes', self.write('quotes.json', json.dumps(quotes)), stdout=out, stderr=err)
+
+        self.assertIn('Imported 1 quotes, created 1 authors, skipped 2 rows', out.getvalue())
+        self.assertIn('Row 2 skipped', err.getvalue())
+        self.assertIn('Row 3 skipped', err.getvalue())
+        self.assertEqual(list(Quote.objects.values_list('name', flat=True)), ['Quote'])
+
+    def test_import_csv_query_count_per_batch(self):
+        rows = ''.join(f'Quote {i},Description of quote {i},Mark Twain;Oscar Wilde\n' for i in range(50))
+        path = self.write('quotes.csv', 'name,description,authors\n' + rows)
+        # SELECT наявних авторів, INSERT і SELECT нових, INSERT цитат, INSERT зв'язків + savepoint
+        with self.assertNumQueries(7):
+            call_command('import_quotes', path, stdout=StringIO())
+        self.assertEqual(Quote.objects.count(), 50)
+        self.assertEqual(Quote.tags.through.objects.count(), 100)
+
+
+@override_settings(QUOTES_PER_PAGE=10)
+class QuoteListPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='Mark Twain')
+        create_quotes(25, [author])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_follow_the_cursor_from_newest(self):
+        response = self.client.get(reverse('noteapp:main'))
+        page = response.context['page']
+        self.assertEqual([quote.name for quote in page.quotes], [f'Quote {i}' for i in range(24, 14, -1)])
+
+        response = self.client.get(reverse('noteapp:main'), {'after': page.next_cursor})
+        page = response.context['page']
+        self.assertEqual([quote.name for quote in page.quotes], [f'Quote {i}' for i in range(14, 4, -1)])
+
+        response = self.client.get(reverse('noteapp:main'), {'after': page.next_cursor})
+        page = response.context['page']
+        self.assertEqual([quote.name for quote in page.quotes], [f'Quote {i}' for i in range(4, -1, -1)])
+        self.assertIsNone(page.next_cursor)
+        self.assertNotContains(response, 'Older quotes')
+
+    def test_cached_page_is_served_without_queries(self):
+        with self.assertNumQueries(2):
+            first = self.client.get(reverse('noteapp:main'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('noteapp:main'))
+        self.assertEqual(first.content, second.content)
+
+    def test_writes_invalidate_cached_pages(self):
+        self.client.get(reverse('noteapp:main'))
+        with self.captureOnCommitCallbacks(execute=True):
+            create_quotes(1, Author.objects.all())
+        self.assertContains(self.client.get(reverse('noteapp:main')), 'Quote 0')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Author.objects.filter(name='Mark Twain').update(name='Samuel Clemens')
+            Author.objects.get().save()
+        self.assertContains(self.client.get(reverse('noteapp:main')), 'Samuel Clemens')
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('noteapp:main'), {'after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+class QuoteSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.einstein, cls.twain = Author.objects.create(name='Albert Einstein'), Author.objects.create(name='Mark Twain')
+        for name, description, author in [
+            ('Imagination', 'Imagination is more important than knowledge', cls.einstein),
+            ('Truth', 'If you tell the truth you do not have to remember anything', cls.twain),
+            ('Knowledge', 'Knowledge speaks, but wisdom listens; knowledge is limited', cls.twain),
+        ]:
+            Quote.objects.create(name=name, description=description).tags.add(author)
+
+    def setUp(self):
+        quote_index.reset()
+
+    def search(self, **params):
+        response = self.client.get(reverse('noteapp:search'), params)
+        return [quote.name for quote in response.context['quotes']]
+
+    def test_all_words_must_match_best_first(self):
+        self.assertEqual(self.search(q='knowledge'), ['Knowledge', 'Imagination'])
+        self.assertEqual(self.search(q='imagination KNOWLEDGE'), ['Imagination'])
+        self.assertEqual(self.search(q='knowledge truth'), [])
+
+    def test_filter_by_author(self):
+        self.assertEqual(self.search(q='knowledge', author='Mark Twain'), ['Knowledge'])
+        self.assertEqual(sorted(self.search(author='Mark Twain')), ['Knowledge', 'Truth'])
+        self.assertEqual(self.search(q='knowledge', author=['Mark Twain', 'Albert Einstein']), ['Knowledge', 'Imagination'])
+
+    def test_index_follows_writes(self):
+        self.assertEqual(self.search(q='wisdom'), ['Knowledge'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Quote.objects.create(name='Wisdom', description='The only true wisdom is in knowing you know nothing')
+        with self.captureOnCommitCallbacks(execute=True):
+            Quote.objects.get(name='Knowledge').delete()
+        self.assertEqual(self.search(q='wisdom'), ['Wisdom'])
+        self.assertEqual(self.search(q='listens'), [])
+
+    def test_search_query_count(self):
+        self.search(q='knowledge')
+        # Індекс уже в пам'яті: цитати, їхні автори та список авторів для фільтра
+        with self.assertNumQueries(3):
+            self.search(q='knowledge', author='Mark Twain')
@@ -1,11 +1,12 @@
-from django.urls import path
-from . import views
-
-app_name = 'noteapp'
-
-urlpatterns = [
-    path('', views.main, name='main'),
-    path('author/', views.author, name='author'),
-    path('quote/', views.quote, name='quote'),
-    path('detail/<int:note_id>', views.detail, name='detail'),
+from django.urls import path
+from . import views
+
+app_name = 'noteapp'
+
+urlpatterns = [
+    path('', views.main, name='main'),
+    path('author/', views.author, name='author'),
+    path('quote/', views.quote, name='quote'),
+    path('detail/<int:quote_id>', views.detail, name='detail'),
+    path('search/', views.search, name='search'),
 ]
\ No newline at end of file
@@ -1,44 +1,96 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from .forms import AuthorForm, QuoteForm
-from .models import Author
-from .models import Quote
-
-
-# Create your views here.
-def main(request):
-    return render(request, 'noteapp/index.html')
-
-def tag(request):
-    if request.method == 'POST':
-        form = AuthorForm(request.POST)
-        if form.is_valid():
-            form.save()
-            return redirect(to='noteapp:main')
-        else:
-            return render(request, 'noteapp/author.html', {'form': form})
-
-    return render(request, 'noteapp/author.html', {'form': AuthorForm()})
-
-
-def quote(request):
-    author = Author.objects.all()
-
-    if request.method == 'POST':
-        form = QuoteForm(request.POST)
-        if form.is_valid():
-            new_quote = form.save()
-
-            choice_author = Author.objects.filter(name__in=request.POST.getlist('author'))
-            for author in choice_author.iterator():
-                new_quote.author.add(author)
-
-            return redirect(to='noteapp:main')
-        else:
-            return render(request, 'noteapp/quote.html', {"author": author, 'form': form})
-
-    return render(request, 'noteapp/quote.html', {"author": author, 'form': QuoteForm()})
-...
-
-def detail(request, quote_id):
-    quote = get_object_or_404(Quote, pk=quote_id)
-    return render(request, 'noteapp/detail.html', {"quote": quote})
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import HttpResponseBadRequest
+from django.shortcuts import render, redirect, get_object_or_404
+from .forms import AuthorForm, QuoteForm
+from .models import Author
+from .models import Quote, link_authors
+from .pagination import QuotePage
+from .search import search_quotes
+from .signals import quote_pages_version
+
+
+def author_prefetch():
+    # Автори всіх вибраних цитат вантажаться одним запитом (лише id та name),
+    # тож кількість запитів не залежить від кількості цитат
+    return Prefetch('tags', queryset=Author.objects.only('id', 'name'))
+
+
+def quote_list_queryset():
+    # search_vector потрібен лише в WHERE пошуку, сторінкам його вантажити не треба
+    return Quote.objects.defer('search_vector').prefetch_related(author_prefetch()).order_by('-created', '-id')
+
+
+def quote_detail_queryset():
+    return Quote.objects.defer('search_vector').prefetch_related(author_prefetch())
+
+
+# Create your views here.
+def main(request):
+    try:
+        page = QuotePage(quote_list_queryset(), settings.QUOTES_PER_PAGE, request.GET.get('after'))
+    except ValueError:
+        return HttpResponseBadRequest('Invalid cursor')
+    # Сторінка рендериться з кешу фрагментів; запити до бази виконуються лише при промаху
+    return render(request, 'noteapp/index.html', {
+        'page': page,
+        'version': quote_pages_version(),
+        'cache_timeout': settings.CACHES['default']['TIMEOUT'],
+    })
+
+def author(request):
+    if request.method == 'POST':
+        form = AuthorForm(request.POST)
+        if form.is_valid():
+            form.save()
+            return redirect(to='noteapp:main')
+        else:
+            return render(request, 'noteapp/author.html', {'form': form})
+
+    return render(request, 'noteapp/author.html', {'form': AuthorForm()})
+
+
+def quote(request):
+    authors = Author.objects.all()
+
+    if request.method == 'POST':
+        form = QuoteForm(request.POST)
+        if form.is_valid():
+            # Цитата та її автори з'являються разом або не з'являються зовсім
+            with transaction.atomic():
+                new_quote = form.save()
+                author_ids = Author.objects.filter(name__in=request.POST.getlist('author')).values_list('id', flat=True)
+                link_authors((new_quote.id, author_id) for author_id in author_ids)
+
+            return redirect(to='noteapp:main')
+        else:
+            return render(request, 'noteapp/quote.html', {"authors": authors, 'form': form})
+
+    return render(request, 'noteapp/quote.html', {"authors": authors, 'form': QuoteForm()})
+
+
+def detail(request, quote_id):
+    quote = get_object_or_404(quote_detail_queryset(), pk=quote_id)
+    return render(request, 'noteapp/detail.html', {"quote": quote})
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    selected = [name for name in request.GET.getlist('author') if name]
+    quotes = quote_list_queryset()
+    if selected:
+        # Підзапит по проміжній таблиці замість JOIN: цитата з кількома авторами не дублюється
+        quotes = quotes.filter(id__in=Quote.tags.through.objects.filter(author__name__in=selected).values('quote_id'))
+    if query:
+        quotes = search_quotes(quotes, query, settings.QUOTE_SEARCH_LIMIT)
+    elif selected:
+        quotes = quotes[:settings.QUOTE_SEARCH_LIMIT]
+    else:
+        quotes = []
+    return render(request, 'noteapp/search.html', {
+        'query': query,
+        'selected': selected,
+        'authors': Author.objects.order_by('name'),
+        'quotes': quotes,
+    })